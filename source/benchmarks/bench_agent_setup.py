@@ -0,0 +1,39 @@
+"""
+Micro-benchmark for per-message agent setup cost.
+
+Compares rebuilding the ReAct graph on every message (the previous behaviour)
+against the cached graph returned by `AgentTaskManagement.get_executor`.
+
+Usage:
+    python benchmarks/bench_agent_setup.py [iterations]
+"""
+import os
+import sys
+import time
+from itertools import repeat
+from langchain_core.messages import AIMessage
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+sys.path.extend([path_root, path_this])
+
+from tools import AgentTaskManagement
+from fakes import FakeToolChatModel
+
+def bench(label: str, func, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed / iterations * 1000:8.3f} ms/message ({iterations} iterations)")
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    llm = FakeToolChatModel(messages=repeat(AIMessage(content="OK")))
+    agent = AgentTaskManagement(llm=llm)
+
+    bench("rebuild", agent._build_executor, iterations)
+    bench("cached", agent.get_executor, iterations)
+
+if __name__ == "__main__":
+    main()
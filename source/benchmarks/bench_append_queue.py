@@ -0,0 +1,70 @@
+"""
+Append throughput: one request per caller vs. the batching append queue.
+
+Simulates a stand-up burst of concurrent `input_task_management` calls
+against a fake Sheets service with a fixed per-request latency and reports
+rows/sec and the number of append requests issued.
+
+Usage:
+    python benchmarks/bench_append_queue.py [callers] [rows_per_caller] [latency_seconds]
+"""
+import os
+import sys
+import time
+import asyncio
+from loguru import logger
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+sys.path.extend([path_root, path_this])
+
+from tools import SpreadsheetTool
+from tools.scheduler import SheetsScheduler
+from tools.append_queue import AppendQueue
+from fakes import FakeSheetsService
+
+def make_rows(caller: int, count: int) -> list:
+    return [
+        [45000.0, f"user{caller}", "Fakhri", "Fusion", "Research", f"task {caller}-{i}", None, 45000.0, None, None, None, "PIC", "on progress", f"user{caller}"]
+        for i in range(count)
+    ]
+
+async def run(label: str, submit, service: FakeSheetsService, callers: int, rows_per_caller: int):
+    service.rows.clear()
+    service.calls["append"] = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(submit(make_rows(caller, rows_per_caller)) for caller in range(callers)))
+    elapsed = time.perf_counter() - start
+    rows = callers * rows_per_caller
+    print(
+        f"{label:<8} {rows} rows in {elapsed * 1000:7.0f} ms  "
+        f"{rows / elapsed:9.0f} rows/sec  {service.calls['append']} append request(s)"
+    )
+
+async def main():
+    logger.remove()
+    callers = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rows_per_caller = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.1
+
+    service = FakeSheetsService(latency=latency)
+    SpreadsheetTool._credentials = classmethod(lambda cls: None)
+    SpreadsheetTool.setup()
+    # measure round-trips, not the quota
+    SpreadsheetTool.scheduler = SheetsScheduler(
+        read_per_minute=1e9,
+        write_per_minute=1e9,
+        read_burst=1e9,
+        write_burst=1e9,
+        max_concurrency=SpreadsheetTool.executor._max_workers
+    )
+    SpreadsheetTool._service = lambda self: service
+    st = SpreadsheetTool()
+
+    await run("direct", st._append_rows, service, callers, rows_per_caller)
+    queue = AppendQueue(st._append_rows, max_delay=0.05, max_batch_size=500)
+    await run("batched", queue.submit, service, callers, rows_per_caller)
+    await queue.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""
+Bulk import/export throughput and memory against a local fake Sheets
+server.
+
+Writes synthetic CSV and JSONL files of `rows` tasks, imports both through
+`tools.bulk.import_tasks` and exports the sheet back to JSONL and CSV. The
+server runs in a separate process so its copy of the sheet does not count
+towards this process's memory; peak RSS growth over the run shows that
+memory stays bounded by the chunk and page sizes rather than the file size.
+
+Usage:
+    python benchmarks/bench_bulk.py [rows] [chunk_size] [latency_seconds]
+"""
+import os
+import sys
+import csv
+import json
+import time
+import socket
+import asyncio
+import tempfile
+import resource
+import threading
+import multiprocessing
+from loguru import logger
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+sys.path.extend([path_root, path_this])
+
+from tools import SpreadsheetTool
+from tools.bulk import COLUMNS, FIELDS, export_tasks, import_tasks
+from fakes import FakeSheetsServer, use_sheets_server
+
+def serve(port: int, latency: float) -> None:
+    FakeSheetsServer([list(COLUMNS)], latency=latency, port=port).start()
+    threading.Event().wait()
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_for(port: int) -> None:
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("fake Sheets server did not start")
+
+def write_inputs(directory: str, rows: int) -> tuple:
+    csv_path, jsonl_path = os.path.join(directory, "tasks.csv"), os.path.join(directory, "tasks.jsonl")
+    with open(csv_path, "w", newline="", encoding="utf-8") as c, open(jsonl_path, "w", encoding="utf-8") as j:
+        writer = csv.writer(c)
+        writer.writerow(FIELDS)
+        for i in range(rows):
+            record = [f"User {i % 200}", f"Project {i % 40}", "Research", f"Imported task {i}", "Fakhri" if i % 3 else ""]
+            writer.writerow(record)
+            j.write(json.dumps(dict(zip(FIELDS, record))) + "\n")
+    return csv_path, jsonl_path
+
+def rss_mib() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def main(rows: int, chunk_size: int, latency: float):
+    port = free_port()
+    server = multiprocessing.Process(target=serve, args=(port, latency), daemon=True)
+    server.start()
+    wait_for(port)
+    use_sheets_server(f"http://127.0.0.1:{port}")
+    st = SpreadsheetTool()
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path, jsonl_path = write_inputs(directory, rows)
+        # build the Sheets client first so its fixed cost is not counted
+        await st._sheets(lambda sheet: sheet.get(spreadsheetId=st.SPREADSHEET_ID, range=f"{st.SHEET}!A1:N1"))
+        baseline = rss_mib()
+        print(f"{rows} rows, chunk {chunk_size}, {latency * 1000:.0f} ms per request, RSS before {baseline:.0f} MiB")
+
+        for label, run in (
+            ("import csv", lambda: import_tasks(st, csv_path, chunk_size=chunk_size)),
+            ("import jsonl", lambda: import_tasks(st, jsonl_path, chunk_size=chunk_size)),
+            ("export jsonl", lambda: export_tasks(st, os.path.join(directory, "export.jsonl"), page_size=chunk_size * 5)),
+            ("export csv", lambda: export_tasks(st, os.path.join(directory, "export.csv"), page_size=chunk_size * 5)),
+        ):
+            result = await run()
+            print(
+                f"{label:<13} {result['rows']:7d} rows in {result['seconds']:6.2f} s  "
+                f"{result['rows'] / result['seconds']:8.0f} rows/s  {result['requests']:4d} requests  "
+                f"peak RSS +{rss_mib() - baseline:.0f} MiB"
+            )
+
+    server.terminate()
+
+if __name__ == "__main__":
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1000,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 0.05,
+    ))
\ No newline at end of file
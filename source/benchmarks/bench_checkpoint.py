@@ -0,0 +1,68 @@
+"""
+Write/read latency of the checkpoint backends.
+
+Runs multi-turn conversations through a small message graph (every turn
+writes checkpoints and pending writes) and then reads the latest checkpoint
+of every thread.
+
+Usage:
+    python benchmarks/bench_checkpoint.py [threads] [turns]
+"""
+import os
+import sys
+import time
+import asyncio
+import tempfile
+from loguru import logger
+from langchain_core.messages import AIMessage
+from langgraph.graph import StateGraph, MessagesState, START, END
+from langgraph.checkpoint.memory import InMemorySaver
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+sys.path.extend([path_root, path_this])
+
+from tools.checkpoint import BoundedInMemorySaver, SQLiteSaver
+
+async def echo(state: MessagesState) -> dict:
+    return {"messages": [AIMessage(content="OK " + state["messages"][-1].content)]}
+
+async def bench(label: str, saver, threads: int, turns: int):
+    builder = StateGraph(MessagesState)
+    builder.add_node("echo", echo)
+    builder.add_edge(START, "echo")
+    builder.add_edge("echo", END)
+    graph = builder.compile(checkpointer=saver)
+
+    start = time.perf_counter()
+    for turn in range(turns):
+        for n in range(threads):
+            config = {"configurable": {"thread_id": f"bench-{n}"}}
+            await graph.ainvoke({"messages": [{"role": "user", "content": f"turn {turn} " + "task " * 20}]}, config)
+    write_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for n in range(threads):
+        await saver.aget_tuple({"configurable": {"thread_id": f"bench-{n}", "checkpoint_ns": ""}})
+    read_elapsed = time.perf_counter() - start
+
+    print(
+        f"{label:<22} turn {write_elapsed / (threads * turns) * 1000:7.3f} ms   "
+        f"read {read_elapsed / threads * 1000:7.3f} ms"
+    )
+
+async def main():
+    logger.remove()
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    await bench("InMemorySaver", InMemorySaver(), threads, turns)
+    await bench("BoundedInMemorySaver", BoundedInMemorySaver(), threads, turns)
+    with tempfile.TemporaryDirectory() as tmp:
+        for batch_size in (1, 32):
+            saver = SQLiteSaver(os.path.join(tmp, f"bench-{batch_size}.sqlite"), batch_size=batch_size)
+            await bench(f"SQLiteSaver batch={batch_size}", saver, threads, turns)
+            saver.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""
+Per-step cost of preparing the model context.
+
+Compares the previous pre-model hook (scan the whole history, keep the last
+6 messages) with `TokenBudgetTrimmer` on a cold and a warm token-count cache,
+for histories of 10, 1k and 10k messages with tool-call pairs mixed in.
+
+Usage:
+    python benchmarks/bench_context_trim.py [budget_tokens]
+"""
+import os
+import sys
+import time
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+sys.path.extend([path_root, path_this])
+
+from tools.context import TokenBudgetTrimmer
+
+def legacy_hook(messages: list) -> list:
+    cleaned_messages = []
+    i = 0
+    while i < len(messages):
+        msg = messages[i]
+        if msg.type == "ai" and getattr(msg, "tool_calls", None):
+            cleaned_messages.append(msg)
+            if i + 1 < len(messages) and messages[i + 1].type == "tool":
+                cleaned_messages.append(messages[i + 1])
+                i += 1
+        elif msg.type in ["human", "ai"]:
+            cleaned_messages.append(msg)
+        i += 1
+    return cleaned_messages[-6:]
+
+def make_history(size: int) -> list:
+    messages = []
+    n = 0
+    while len(messages) < size:
+        messages.append(HumanMessage(content=f"Fusion | Adjust Network Cognitive Warfare {n} | Fakhri", id=f"h{n}"))
+        messages.append(AIMessage(
+            content="",
+            id=f"a{n}",
+            tool_calls=[{"name": "check_task_management", "args": {"name": "Fakhri"}, "id": f"call{n}"}]
+        ))
+        messages.append(ToolMessage(content="📌 Terdapat 3 task yang belum selesai " * 5, tool_call_id=f"call{n}", id=f"t{n}"))
+        messages.append(AIMessage(content="Task berhasil ditambahkan.", id=f"r{n}"))
+        n += 1
+    return messages[:size]
+
+def bench(label: str, func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+def main():
+    budget = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    print(f"{'messages':>9} {'legacy':>10} {'trim cold':>10} {'trim warm':>10}  kept")
+    for size in (10, 1_000, 10_000):
+        history = make_history(size)
+        iterations = 200 if size < 10_000 else 20
+        legacy = bench("legacy", lambda: legacy_hook(history), iterations)
+
+        trimmer = TokenBudgetTrimmer(max_tokens=budget)
+        start = time.perf_counter()
+        kept = trimmer.trim(history)
+        cold = (time.perf_counter() - start) * 1000
+        warm = bench("warm", lambda: trimmer.trim(history), iterations)
+        print(f"{size:>9} {legacy:>8.3f}ms {cold:>8.3f}ms {warm:>8.3f}ms  {len(kept)}")
+
+if __name__ == "__main__":
+    main()
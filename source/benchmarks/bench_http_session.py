@@ -0,0 +1,72 @@
+"""
+HTTP client cost per call: a new `aiohttp.ClientSession` per request (the
+previous `_requests`) vs. the shared connection-pooled session.
+
+Calls a local aiohttp JSON endpoint sequentially and with `concurrency`
+callers at once, and reports mean milliseconds per call. Over TLS and real
+DNS the per-call savings are larger than on a plain local socket.
+
+Usage:
+    python benchmarks/bench_http_session.py [calls] [concurrency]
+"""
+import os
+import sys
+import time
+import asyncio
+import aiohttp
+from aiohttp import web
+from loguru import logger
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+sys.path.extend([path_root, path_this])
+
+from tools import BaseTaskManagement
+
+async def per_call_session(uri: str, params: dict) -> dict:
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
+        async with session.get(uri, params=params) as response:
+            return await response.json()
+
+async def bench(label: str, call, calls: int, concurrency: int):
+    start = time.perf_counter()
+    for _ in range(calls):
+        await call()
+    sequential = (time.perf_counter() - start) / calls
+
+    async def worker():
+        for _ in range(calls // concurrency):
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    concurrent = (time.perf_counter() - start) / (calls // concurrency * concurrency)
+    print(f"{label:<14} sequential {sequential * 1000:7.3f} ms/call   {concurrency} concurrent {concurrent * 1000:7.3f} ms/call")
+
+async def main(calls: int, concurrency: int):
+    async def handle(request: web.Request) -> web.Response:
+        return web.json_response({"ok": True, "name": request.query.get("name")})
+
+    app = web.Application()
+    app.router.add_get("/ping", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    uri = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/ping"
+
+    client = BaseTaskManagement()
+    await BaseTaskManagement.open_session()
+    try:
+        await bench("session/call", lambda: per_call_session(uri, {"name": "Fakhri"}), calls, concurrency)
+        await bench("shared", lambda: client._requests(uri, {"name": "Fakhri"}, "bench", method="get"), calls, concurrency)
+    finally:
+        await BaseTaskManagement.close_session()
+        await runner.cleanup()
+
+if __name__ == "__main__":
+    logger.remove()
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    ))
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Cold import time of the bot modules, from `python -X importtime`.
+
+Imports each module in a fresh interpreter `repeats` times and reports the
+median cumulative import time, the heaviest direct imports it pulled
+in, and whether any of the deferred heavy libraries (LangChain, LangGraph,
+OpenAI, the Google API client) were loaded. Results are compared with
+`baselines/import_time.json`; the exit status is 1 when a module is slower
+than its baseline by more than `--tolerance`.
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeats 5] [--tolerance 0.25] [--save-baseline]
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import platform
+import statistics
+import subprocess
+from typing import *
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+
+BASELINE_PATH = os.path.join(path_this, "baselines", "import_time.json")
+MODULES = ("tools", "tools.spreadsheet", "tools.agent", "api_bot")
+DEFERRED = ("langchain", "langchain_core", "langchain_openai", "langgraph", "openai", "googleapiclient", "google.oauth2", "tiktoken")
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+
+def import_once(module: str) -> List[Tuple[int, int, str]]:
+    """
+    Import `module` in a new interpreter and return `(depth, cumulative_us, name)`
+    for every module it imported.
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([path_root, os.path.join(path_root, "service")])}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=path_root, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    entries = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            entries.append(((len(match.group(3)) - 1) // 2, int(match.group(2)), match.group(4)))
+    return entries
+
+def measure(module: str, repeats: int) -> Dict[str, Any]:
+    runs = []
+    for _ in range(repeats):
+        entries = import_once(module)
+        total = next(cumulative for depth, cumulative, name in reversed(entries) if depth == 0 and name == module)
+        runs.append((total, entries))
+    runs.sort(key=lambda run: run[0])
+    total, entries = runs[len(runs) // 2]
+    names = {name for _, _, name in entries}
+    # children are listed before their parent, so the module's direct
+    # imports are the depth-1 entries since the previous top-level one
+    end = max(i for i, (depth, _, name) in enumerate(entries) if depth == 0 and name == module)
+    begin = max((i for i, (depth, _, _) in enumerate(entries[:end]) if depth == 0), default=-1) + 1
+    heaviest = sorted(((cumulative, name) for depth, cumulative, name in entries[begin:end] if depth == 1), reverse=True)[:5]
+    return {
+        "ms": statistics.median(run[0] for run in runs) / 1000,
+        "modules": len(names),
+        "deferred_loaded": sorted(prefix for prefix in DEFERRED if any(name == prefix or name.startswith(prefix + ".") for name in names)),
+        "heaviest": [f"{name} {cumulative / 1000:.0f}ms" for cumulative, name in heaviest],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import time of the bot modules.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown over the baseline, as a fraction")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    args = parser.parse_args()
+
+    baselines = json.load(open(BASELINE_PATH)) if os.path.exists(BASELINE_PATH) else {}
+    results = {module: measure(module, args.repeats) for module in MODULES}
+
+    regressed = []
+    print(f"{'module':<20}{'ms':>9}{'baseline':>10}{'change':>9}{'modules':>9}  deferred libraries loaded")
+    for module, result in results.items():
+        line = f"{module:<20}{result['ms']:>9.1f}"
+        previous = baselines.get(module, {}).get("ms")
+        if previous:
+            change = (result["ms"] - previous) / previous
+            line += f"{previous:>10.1f}{change * 100:>+8.1f}%"
+            if change > args.tolerance:
+                regressed.append(module)
+        else:
+            line += f"{'-':>10}{'-':>9}"
+        print(f"{line}{result['modules']:>9}  {', '.join(result['deferred_loaded']) or 'none'}")
+        print(f"{'':<20}heaviest: {', '.join(result['heaviest']) or '-'}")
+
+    if args.save_baseline:
+        baselines = {
+            module: {"ms": result["ms"], "modules": result["modules"], "python": platform.python_version(), "machine": platform.machine()}
+            for module, result in results.items()
+        }
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {BASELINE_PATH}")
+    elif regressed:
+        print(f"Import time regressed by more than {args.tolerance:.0%}: {', '.join(regressed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
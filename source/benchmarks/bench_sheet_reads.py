@@ -0,0 +1,66 @@
+"""
+Concurrent sheet reads: one full read per call vs. the coalesced, cached
+read path behind `get_undone_task`.
+
+Fires `callers` concurrent /check_task lookups at a cold cache, then again
+at a warm one, against a fake Sheets service with a fixed per-request
+latency, and reports wall time, Sheets reads issued and the task cache
+counters.
+
+Usage:
+    python benchmarks/bench_sheet_reads.py [callers] [rows] [latency_seconds]
+"""
+import os
+import sys
+import time
+import asyncio
+from loguru import logger
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+sys.path.extend([path_root, path_this])
+
+from tools import SpreadsheetTool
+from tools.scheduler import SheetsScheduler
+from tools.task_cache import TaskCache
+from fakes import FakeSheetsService
+
+def make_rows(count: int) -> list:
+    return [
+        ["45000", f"user{i % 50}", "Fakhri", "Fusion", "Research", f"task {i}", "", "45000", "", "", "Fakhri", "PIC", "done" if i % 3 else "on progress", ""]
+        for i in range(count)
+    ]
+
+async def run(label: str, lookup, service: FakeSheetsService, callers: int):
+    service.calls["get"] = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(lookup(f"user{caller % 50}") for caller in range(callers)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {callers} lookups in {elapsed * 1000:7.0f} ms  {service.calls['get']:4d} Sheets read(s)")
+
+async def main(callers: int, rows: int, latency: float):
+    service = FakeSheetsService(make_rows(rows), latency=latency)
+    SpreadsheetTool._credentials = classmethod(lambda cls: None)
+    SpreadsheetTool._service = lambda self: service
+    SpreadsheetTool.values_resource = None
+    SpreadsheetTool.setup()
+    SpreadsheetTool.scheduler = SheetsScheduler(1e9, 1e9, 1e9, 1e9, max_concurrency=SpreadsheetTool.executor._max_workers)
+    tool = SpreadsheetTool()
+
+    async def uncached(name: str):
+        result = await tool._sheets(lambda sheet: sheet.get(spreadsheetId=tool.SPREADSHEET_ID, range=f"{tool.SHEET}!A:N"))
+        return [row for row in result.get("values", []) if row[1] == name and row[12] != "done"]
+
+    await run("per call", uncached, service, callers)
+    SpreadsheetTool.task_cache = TaskCache()
+    await run("coalesced", tool.get_undone_task, service, callers)
+    await run("cached", tool.get_undone_task, service, callers)
+    print(f"task cache {SpreadsheetTool.task_cache.stats()}")
+
+if __name__ == "__main__":
+    logger.remove()
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5000,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 0.2,
+    ))
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Per-call overhead of creating the Sheets client.
+
+Compares loading the service-account key and building the discovery client
+on every call (the previous behaviour) with the cached, shared client. Uses
+a throwaway key and a pre-issued token, so no network access is needed.
+
+Usage:
+    python benchmarks/bench_sheets_client.py [iterations]
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+from datetime import datetime, timedelta
+import rsa
+from loguru import logger
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+sys.path.extend([path_root, path_this])
+
+from tools import SpreadsheetTool
+
+def write_fake_key(path: str) -> None:
+    _, key = rsa.newkeys(1024)
+    pem = key.save_pkcs1().decode()
+    with open(path, "w") as f:
+        json.dump({
+            "type": "service_account",
+            "project_id": "bench",
+            "private_key_id": "bench",
+            "private_key": pem,
+            "client_email": "bench@bench.iam.gserviceaccount.com",
+            "client_id": "0",
+            "token_uri": "https://oauth2.googleapis.com/token",
+        }, f)
+
+def bench(label: str, func, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed / iterations * 1000:8.3f} ms/call ({iterations} iterations)")
+
+def main():
+    logger.remove()
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    with tempfile.TemporaryDirectory() as tmp:
+        key_path = os.path.join(tmp, "service_account.json")
+        write_fake_key(key_path)
+        SpreadsheetTool.SERVICE_ACCOUNT_FILE = key_path
+
+        def per_call():
+            creds = service_account.Credentials.from_service_account_file(key_path, scopes=SpreadsheetTool.SCOPES)
+            service = build("sheets", "v4", credentials=creds)
+            service.spreadsheets().values().get(spreadsheetId=SpreadsheetTool.SPREADSHEET_ID, range="A:N")
+
+        st = SpreadsheetTool()
+        SpreadsheetTool.credentials = service_account.Credentials.from_service_account_file(key_path, scopes=SpreadsheetTool.SCOPES)
+        SpreadsheetTool.credentials.token = "bench"
+        SpreadsheetTool.credentials.expiry = datetime.utcnow() + timedelta(hours=1)
+
+        def cached():
+            SpreadsheetTool._credentials()
+            st._values().get(spreadsheetId=SpreadsheetTool.SPREADSHEET_ID, range="A:N")
+
+        bench("per-call", per_call, iterations)
+        bench("cold", cached, 1)
+        bench("cached", cached, iterations)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Concurrency of Sheets calls against a fake slow backend.
+
+Fires N concurrent `get_undone_task` calls (what N simultaneous `/check_task`
+commands do) against a fake Sheets service with a fixed per-call latency.
+With the thread-pool executor the batch finishes in about one latency
+instead of N.
+
+Usage:
+    python benchmarks/bench_sheets_concurrency.py [concurrency] [latency_seconds]
+"""
+import os
+import sys
+import time
+import asyncio
+from loguru import logger
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+sys.path.extend([path_root, path_this])
+
+from tools import SpreadsheetTool
+from tools.scheduler import SheetsScheduler
+from fakes import FakeSheetsService
+
+async def main():
+    logger.remove()
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+
+    rows = [["45000", f"user{i % 10}", "Fakhri", "Fusion", "Research", f"task {i}", "", "45000", "", "", "", "PIC", "on progress", f"user{i % 10}"] for i in range(100)]
+    service = FakeSheetsService(rows, latency=latency)
+    SpreadsheetTool._credentials = classmethod(lambda cls: None)
+    SpreadsheetTool.setup()
+    # measure round-trips, not the quota
+    SpreadsheetTool.scheduler = SheetsScheduler(
+        read_per_minute=1e9,
+        write_per_minute=1e9,
+        read_burst=1e9,
+        write_burst=1e9,
+        max_concurrency=SpreadsheetTool.executor._max_workers
+    )
+    SpreadsheetTool._service = lambda self: service
+    st = SpreadsheetTool()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(st.get_undone_task(f"user{i % 10}") for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{concurrency} concurrent calls, {latency * 1000:.0f} ms latency: "
+        f"{elapsed * 1000:.0f} ms total ({elapsed / latency:.1f}x latency, "
+        f"max_workers={SpreadsheetTool.executor._max_workers})"
+    )
+
+if __name__ == "__main__":
+    asyncio.run(main())
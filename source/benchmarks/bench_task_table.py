@@ -0,0 +1,106 @@
+"""
+Columnar task table vs. the list-of-lists sheet rows.
+
+Builds a synthetic sheet, then compares the memory held by the raw rows
+and by the bot's `TaskCache` (rows plus indexes) with a `TaskTable` of the
+same rows, which the cache builds on top of its rows only when asked for
+one, and the time of typical queries: one
+user's undone tasks (the previous `get_undone_task` scan, re-normalizing
+every row), open tasks per assignee and per project, a start-date range and
+the mean duration per assignee.
+
+Usage:
+    python benchmarks/bench_task_table.py [rows] [repeats]
+"""
+import os
+import sys
+import json
+import time
+import random
+import tracemalloc
+from collections import Counter
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+sys.path.extend([path_root, path_this])
+
+from tools.task_cache import TaskCache
+from tools.task_table import TaskTable
+
+def make_rows(count: int) -> list:
+    rng = random.Random(0)
+    rows = []
+    for i in range(count):
+        start = 45000 + i / 200
+        done = rng.random() < 0.8
+        rows.append([
+            str(start), f"User {rng.randrange(200)}", "Fakhri", f"Project {rng.randrange(40)}", rng.choice(["Research", "Development", "Delivery"]),
+            f"Sub task {i}", "", str(start), str(start + rng.random() * 3) if done else "", str(rng.randrange(30, 4000)) if done else "",
+            "Fakhri", "PIC", "done" if done else "on progress", "",
+        ])
+    return rows
+
+def measure(build):
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+def timeit(func, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1000
+
+def scan_undone(rows: list, name: str) -> list:
+    return [row for row in rows if row[1].strip().lower() == name.lower() and row[12].strip().lower() != "done"]
+
+def scan_open_by(rows: list, column: int) -> Counter:
+    return Counter(row[column].strip() for row in rows if row[12].strip().lower() != "done")
+
+def scan_date_range(rows: list, low: float, high: float) -> list:
+    return [row for row in rows if row[7] and low <= float(row[7]) <= high]
+
+def scan_mean_duration(rows: list) -> dict:
+    totals = {}
+    for row in rows:
+        if row[9]:
+            total = totals.setdefault(row[1].strip(), [0.0, 0])
+            total[0] += float(row[9])
+            total[1] += 1
+    return {name: total / count for name, (total, count) in totals.items()}
+
+def main(count: int, repeats: int):
+    source = make_rows(count)
+    # decode from JSON so every cell is its own string, as in a Sheets response
+    rows, rows_bytes = measure(lambda: json.loads(json.dumps(source)))
+    cache = TaskCache()
+    _, cache_bytes = measure(lambda: cache.load(json.loads(json.dumps(source))))
+    table, table_bytes = measure(lambda: TaskTable.from_rows(source))
+    print(
+        f"{count} rows: list-of-lists {rows_bytes / 2**20:7.1f} MiB   task cache {cache_bytes / 2**20:7.1f} MiB   "
+        f"columnar {table_bytes / 2**20:7.1f} MiB (+{table_bytes / cache_bytes:.0%} on top of the cache)"
+    )
+
+    low, high = 45000 + count / 800, 45000 + count / 400
+    assert len(scan_undone(rows, "User 7")) == len(table.select(assignee="User 7", open_only=True))
+    assert len(scan_date_range(rows, low, high)) == len(table.select(date_from=low, date_to=high))
+
+    queries = [
+        ("undone of one user", lambda: scan_undone(rows, "User 7"), lambda: table.select(assignee="user 7", open_only=True)),
+        ("open per assignee", lambda: scan_open_by(rows, 1), lambda: table.open_by("assignee")),
+        ("open per project", lambda: scan_open_by(rows, 3), lambda: table.open_by("project")),
+        ("start date range", lambda: scan_date_range(rows, low, high), lambda: table.select(date_from=low, date_to=high)),
+        ("mean duration/user", lambda: scan_mean_duration(rows), lambda: table.mean_duration(by="assignee")),
+    ]
+    print(f"{'query':<20}{'rows ms':>10}{'table ms':>10}{'speedup':>9}")
+    for label, scan, query in queries:
+        scan_ms, query_ms = timeit(scan, repeats), timeit(query, repeats)
+        print(f"{label:<20}{scan_ms:>10.3f}{query_ms:>10.3f}{scan_ms / query_ms:>8.1f}x")
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    )
\ No newline at end of file
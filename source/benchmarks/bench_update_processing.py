@@ -0,0 +1,82 @@
+"""
+Update processing load test: sequential (the ApplicationBuilder default)
+vs. concurrent with per-chat ordering.
+
+Simulates `users` chats that each send `messages` slow agent messages
+followed by one /info. Every update is handed to the update processor in
+arrival order, the way `Application` does it. Reports the total time, the
+/info latency and whether every chat's messages finished in order.
+
+Usage:
+    python benchmarks/bench_update_processing.py [users] [messages] [agent_seconds] [concurrency]
+"""
+import os
+import sys
+import time
+import asyncio
+import statistics
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+sys.path.extend([path_root, path_this, os.path.join(path_root, "service")])
+
+from telegram import Update
+from telegram.ext import SimpleUpdateProcessor
+from update_processor import ChatOrderedUpdateProcessor
+
+def make_update(update_id: int, chat_id: int, text: str) -> Update:
+    return Update.de_json({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": f"user{chat_id}"},
+            "text": text,
+        }
+    }, None)
+
+async def run(label: str, processor, users: int, messages: int, agent_seconds: float):
+    finished = {chat_id: [] for chat_id in range(users)}
+    info_latency = []
+
+    async def handle(update: Update, received_at: float):
+        chat_id, text = update.effective_chat.id, update.effective_message.text
+        if text == "/info":
+            info_latency.append(time.perf_counter() - received_at)
+            return
+        await asyncio.sleep(agent_seconds)
+        finished[chat_id].append(int(text.rsplit(" ", 1)[1]))
+
+    updates = []
+    for i in range(messages):
+        updates.extend(make_update(len(updates), chat_id, f"Fusion task {i}") for chat_id in range(users))
+    updates.extend(make_update(len(updates), chat_id, "/info") for chat_id in range(users))
+
+    await processor.initialize()
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(processor.process_update(update, handle(update, start))) for update in updates]
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    await processor.shutdown()
+
+    in_order = all(done == sorted(done) and len(done) == messages for done in finished.values())
+    print(
+        f"{label:<13} total {elapsed:6.2f} s  "
+        f"/info p50 {statistics.median(info_latency) * 1000:8.1f} ms  max {max(info_latency) * 1000:8.1f} ms  "
+        f"per-chat order kept: {in_order}"
+    )
+
+async def main(users: int, messages: int, agent_seconds: float, concurrency: int):
+    print(f"{users} chats x {messages} agent messages ({agent_seconds}s each) + 1 /info each")
+    await run("sequential", SimpleUpdateProcessor(1), users, messages, agent_seconds)
+    await run("chat-ordered", ChatOrderedUpdateProcessor(max_concurrent_updates=concurrency), users, messages, agent_seconds)
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(
+        int(args[0]) if len(args) > 0 else 20,
+        int(args[1]) if len(args) > 1 else 3,
+        float(args[2]) if len(args) > 2 else 0.1,
+        int(args[3]) if len(args) > 3 else 8,
+    ))
\ No newline at end of file
@@ -0,0 +1,276 @@
+import re
+import time
+import asyncio
+import threading
+from typing import *
+from urllib.parse import unquote
+from aiohttp import web
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+
+class FakeToolChatModel(GenericFakeChatModel):
+    """
+    Deterministic chat model for offline benchmarks.
+
+    Accepts `bind_tools` so it can be plugged into `create_react_agent`
+    without an OpenAI key.
+    """
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs) -> "FakeToolChatModel":
+        return self
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Deterministic stand-in for the agent's chat model that answers from the
+    conversation itself, so any number of users can share one instance.
+
+    A new "<name>: <text>" user message is answered with a
+    `check_task_management` tool call for `<name>`, and a tool result with a
+    short reply quoting it. Every call takes `latency` seconds.
+    """
+
+    latency: float = 0.0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs) -> "ScriptedChatModel":
+        return self
+
+    def _reply(self, messages: List[BaseMessage]) -> ChatResult:
+        self.calls += 1
+        last = messages[-1]
+        if last.type == "tool":
+            message = AIMessage(content=f"Berikut ringkasan task Anda:\n{str(last.content)[:200]}")
+        else:
+            text = last.content if isinstance(last.content, str) else ""
+            name = text.split(":", 1)[0].strip() if ":" in text else "user"
+            message = AIMessage(content="", tool_calls=[
+                {"name": "check_task_management", "args": {"name": name}, "id": f"call_{self.calls}"}
+            ])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return self._reply(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._reply(messages)
+
+
+class FakeCategoryModel:
+    """
+    Stand-in for the task classifier's model: every sub-task is "Project".
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def with_structured_output(self, schema: Any) -> RunnableLambda:
+        async def classify(messages: List[dict]) -> Any:
+            await asyncio.sleep(self.latency)
+            return schema(task=["Project"] * len(messages[-1]["content"].splitlines()))
+        return RunnableLambda(classify)
+
+
+class FakeRequest:
+    """
+    Stand-in for a googleapiclient `HttpRequest`; `execute` blocks for
+    `latency` seconds like a real Sheets round-trip.
+    """
+
+    def __init__(self, func: Callable[[], dict], latency: float):
+        self.func = func
+        self.latency = latency
+
+    def execute(self) -> dict:
+        time.sleep(self.latency)
+        return self.func()
+
+
+class FakeSheetsService:
+    """
+    In-process fake of `build("sheets", "v4")` backed by a list of rows.
+
+    Supports `spreadsheets().values().get/batchGet/append/batchUpdate` on
+    A:N ranges, which is all `SpreadsheetTool` uses.
+    """
+
+    def __init__(self, rows: Optional[List[list]] = None, latency: float = 0.0):
+        self.rows: List[list] = rows if rows is not None else []
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.calls: Dict[str, int] = {"get": 0, "batchGet": 0, "append": 0, "batchUpdate": 0}
+
+    def spreadsheets(self) -> "FakeSheetsService":
+        return self
+
+    def values(self) -> "FakeSheetsService":
+        return self
+
+    def _read(self, range: str) -> dict:
+        match = re.search(r"![A-Z]+(\d+)(?::[A-Z]+(\d+))?", range)
+        start = int(match.group(1)) - 1 if match else 0
+        end = int(match.group(2)) if match and match.group(2) else None
+        values = [list(row) for row in self.rows[start:end]]
+        # like Sheets, leave trailing empty rows out of the range
+        while values and not any(values[-1]):
+            values.pop()
+        return {"range": range, "values": values}
+
+    def get(self, spreadsheetId: str, range: str, **kwargs) -> FakeRequest:
+        def run() -> dict:
+            with self.lock:
+                self.calls["get"] += 1
+                return self._read(range)
+        return FakeRequest(run, self.latency)
+
+    def batchGet(self, spreadsheetId: str, ranges: List[str], **kwargs) -> FakeRequest:
+        def run() -> dict:
+            with self.lock:
+                self.calls["batchGet"] += 1
+                return {"valueRanges": [self._read(range) for range in ranges]}
+        return FakeRequest(run, self.latency)
+
+    def append(self, spreadsheetId: str, range: str, body: dict, **kwargs) -> FakeRequest:
+        def run() -> dict:
+            with self.lock:
+                self.calls["append"] += 1
+                start = len(self.rows) + 1
+                self.rows.extend(
+                    ["" if value is None else str(value) for value in row] for row in body["values"]
+                )
+                sheet = range.split("!")[0]
+                return {"updates": {"updatedRange": f"{sheet}!A{start}:N{len(self.rows)}", "updatedRows": len(body["values"])}}
+        return FakeRequest(run, self.latency)
+
+    def batchUpdate(self, spreadsheetId: str, body: dict, **kwargs) -> FakeRequest:
+        def run() -> dict:
+            with self.lock:
+                self.calls["batchUpdate"] += 1
+                for update in body["data"]:
+                    cells = update["range"].split("!")[1]
+                    start, _ = cells.split(":")
+                    column = ord(start[0]) - ord("A")
+                    index = int(start[1:]) - 1
+                    row = self.rows[index]
+                    values = update["values"][0]
+                    row.extend([""] * max(0, column + len(values) - len(row)))
+                    row[column:column + len(values)] = [str(value) for value in values]
+                return {"totalUpdatedRows": len(body["data"])}
+        return FakeRequest(run, self.latency)
+
+
+class FakeSheetsServer:
+    """
+    Local HTTP stand-in for the Sheets v4 `values.get`, `values.batchGet`,
+    `values.append` and `values.batchUpdate` endpoints, backed by a `FakeSheetsService`.
+
+    Runs on its own thread and event loop so the real client can call it
+    from the thread pool; point `[spreadsheet] api_endpoint` at `url`. Every
+    request takes `latency` seconds.
+    """
+
+    def __init__(self, rows: Optional[List[list]] = None, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.sheet = FakeSheetsService(rows)
+        self.latency = latency
+        self.host = host
+        self.port = port
+        self.url: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def _get(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency)
+        return web.json_response(self.sheet.get(request.match_info["id"], unquote(request.match_info["range"])).execute())
+
+    async def _batch_get(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency)
+        return web.json_response(self.sheet.batchGet(request.match_info["id"], request.query.getall("ranges", [])).execute())
+
+    async def _append(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency)
+        cell_range = unquote(request.match_info["range"])
+        if not cell_range.endswith(":append"):
+            raise web.HTTPNotFound()
+        body = await request.json()
+        return web.json_response(self.sheet.append(request.match_info["id"], cell_range[:-len(":append")], body).execute())
+
+    async def _batch_update(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency)
+        body = await request.json()
+        return web.json_response(self.sheet.batchUpdate(request.match_info["id"], body).execute())
+
+    def start(self) -> str:
+        """
+        Start serving and return the base URL.
+        """
+        ready = threading.Event()
+
+        async def serve() -> None:
+            app = web.Application(client_max_size=256 * 1024 * 1024)
+            app.router.add_post("/v4/spreadsheets/{id}/values:batchUpdate", self._batch_update)
+            app.router.add_get("/v4/spreadsheets/{id}/values:batchGet", self._batch_get)
+            app.router.add_get("/v4/spreadsheets/{id}/values/{range}", self._get)
+            app.router.add_post("/v4/spreadsheets/{id}/values/{range}", self._append)
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            site = web.TCPSite(self._runner, self.host, self.port)
+            await site.start()
+            self.port = site._server.sockets[0].getsockname()[1]
+            self.url = f"http://{self.host}:{self.port}"
+            ready.set()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(serve())
+            self._loop.run_forever()
+            self._loop.run_until_complete(self._runner.cleanup())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="fake-sheets", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.url
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+
+def use_sheets_server(url: str) -> None:
+    """
+    Point `SpreadsheetTool` at a Sheets stand-in such as `FakeSheetsServer`:
+    unauthenticated keep-alive transports and no quota throttling.
+    """
+    import httplib2
+    from tools import SpreadsheetTool
+    from tools.scheduler import SheetsScheduler
+    from tools.settings import get_config
+
+    config = get_config()
+    if not config.has_section("spreadsheet"):
+        config.add_section("spreadsheet")
+    config.set("spreadsheet", "api_endpoint", url)
+    local = threading.local()
+
+    def http(cls) -> httplib2.Http:
+        if getattr(local, "http", None) is None:
+            local.http = httplib2.Http(timeout=30)
+        return local.http
+
+    SpreadsheetTool._credentials = classmethod(lambda cls: None)
+    SpreadsheetTool._http = classmethod(http)
+    SpreadsheetTool.service = None
+    SpreadsheetTool.values_resource = None
+    SpreadsheetTool.setup()
+    SpreadsheetTool.scheduler = SheetsScheduler(1e9, 1e9, 1e9, 1e9, max_concurrency=SpreadsheetTool.executor._max_workers)
\ No newline at end of file
@@ -0,0 +1,209 @@
+"""
+Offline load test: synthetic Telegram users against the real bot handlers,
+update processor, agent graph and Sheets client, with a scripted chat model
+and a local HTTP stand-in for the Sheets API. No network, API keys or
+`config.conf` are needed.
+
+Each user repeats `rounds` times: send a "Project | Task | Assignor"
+message, /check_task, then /chat, waiting for each reply before sending
+the next message. Reports p50/p95/p99 latency per action and overall,
+throughput and peak RSS, and compares them with the stored baseline for
+the same scenario in `baselines/load_test.json`.
+
+Usage:
+    python benchmarks/load_test.py [--users 50] [--rounds 3] [--rows 5000]
+        [--llm-latency 0.2] [--sheets-latency 0.05] [--save-baseline]
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import resource
+import platform
+import statistics
+from typing import *
+from loguru import logger
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+sys.path.extend([path_root, path_this, os.path.join(path_root, "service")])
+
+from telegram import Message, Update, User
+from telegram.ext import ExtBot
+
+import api_bot
+from tools import AgentTaskManagement, BoundedInMemorySaver, TaskClassifier
+from fakes import FakeCategoryModel, FakeSheetsServer, ScriptedChatModel, use_sheets_server
+
+BASELINE_PATH = os.path.join(path_this, "baselines", "load_test.json")
+ACTIONS = ("task", "check_task", "chat")
+BOT_USER = User(id=1, first_name="Bot", is_bot=True, username="task_bot")
+
+def seed_rows(rows: int, users: int) -> List[list]:
+    rng = random.Random(0)
+    return [
+        [
+            str(45000 + i / 100), f"user{rng.randrange(users * 2)}", "Fakhri", f"Project {i % 20}", "Research",
+            f"Seed task {i}", "", str(45000 + i / 100), "", "", "Fakhri", "PIC",
+            "done" if rng.random() < 0.7 else "on progress", "",
+        ]
+        for i in range(rows)
+    ]
+
+def patch_offline(server_url: str, llm_latency: float) -> None:
+    """
+    Point the bot at the fake Sheets server and fake models, and stub the
+    Telegram Bot API calls made by the handlers.
+    """
+    use_sheets_server(server_url)
+
+    api_bot.memory = BoundedInMemorySaver()
+    api_bot.agent = AgentTaskManagement(llm=ScriptedChatModel(latency=llm_latency), checkpoint=api_bot.memory)
+    api_bot.classifier = TaskClassifier(llm=FakeCategoryModel(latency=llm_latency))
+    api_bot.get_digest().subscribers_path = None
+    api_bot.streaming = False
+
+    async def initialize(self) -> None:
+        self._bot_user = BOT_USER
+        self._initialized = True
+
+    async def noop(self, *args, **kwargs) -> None:
+        return None
+
+    ExtBot.initialize = initialize
+    ExtBot.shutdown = noop
+
+class Driver:
+    """
+    Feeds synthetic updates into the application and times each reply.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+        self.update_ids = iter(range(1, 1 << 62))
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.latencies: Dict[str, List[float]] = {action: [] for action in ACTIONS}
+        self.errors = 0
+
+        driver = self
+
+        async def reply_text(message: Message, text: str, *args, **kwargs) -> None:
+            future = driver.pending.pop(message.message_id, None)
+            if future is not None and not future.done():
+                future.set_result(text)
+
+        Message.reply_text = reply_text
+
+    def update(self, user: int, text: str) -> Update:
+        update_id = next(self.update_ids)
+        entities = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}] if text.startswith("/") else []
+        return Update.de_json({
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": 1000 + user, "type": "private"},
+                "from": {"id": 1000 + user, "is_bot": False, "first_name": f"user{user}"},
+                "text": text,
+                "entities": entities,
+            }
+        }, self.app.bot)
+
+    async def send(self, action: str, user: int, text: str) -> None:
+        update = self.update(user, text)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[update.update_id] = future
+        started_at = time.perf_counter()
+        await self.app.update_queue.put(update)
+        reply = await future
+        self.latencies[action].append(time.perf_counter() - started_at)
+        if reply.startswith(("❌", "Maaf")):
+            self.errors += 1
+
+    async def user(self, user: int, rounds: int) -> None:
+        for round_ in range(rounds):
+            await self.send("task", user, f"Fusion | Load test task {user}-{round_} | Fakhri")
+            await self.send("check_task", user, "/check_task")
+            await self.send("chat", user, "/chat task apa saja yang belum selesai?")
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50_ms": cuts[49] * 1000, "p95_ms": cuts[94] * 1000, "p99_ms": cuts[98] * 1000}
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    server = FakeSheetsServer(seed_rows(args.rows, args.users), latency=args.sheets_latency)
+    patch_offline(server.start(), args.llm_latency)
+
+    app = api_bot.build_application(updater=False)
+    driver = Driver(app)
+    await app.initialize()
+    await app.start()
+    try:
+        started_at = time.perf_counter()
+        await asyncio.gather(*(driver.user(user, args.rounds) for user in range(args.users)))
+        elapsed = time.perf_counter() - started_at
+    finally:
+        await app.stop()
+        await api_bot.shutdown(app)
+        await app.shutdown()
+        server.stop()
+
+    samples = [latency for action in ACTIONS for latency in driver.latencies[action]]
+    return {
+        "requests": len(samples),
+        "errors": driver.errors,
+        "seconds": elapsed,
+        "throughput_rps": len(samples) / elapsed,
+        **percentiles(samples),
+        **{f"{action}_{key}": value for action in ACTIONS for key, value in percentiles(driver.latencies[action]).items()},
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "sheets_calls": dict(server.sheet.calls),
+    }
+
+def report(scenario: str, result: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print(f"scenario {scenario}: {result['requests']} requests, {result['errors']} error replies in {result['seconds']:.2f} s")
+    print(f"sheets calls {result['sheets_calls']}")
+    print(f"{'metric':<22}{'current':>12}{'baseline':>12}{'change':>10}")
+    for key, value in result.items():
+        if not isinstance(value, float):
+            continue
+        line = f"{key:<22}{value:>12.1f}"
+        if baseline and isinstance(baseline.get(key), (int, float)):
+            previous = baseline[key]
+            change = (value - previous) / previous * 100 if previous else 0.0
+            line += f"{previous:>12.1f}{change:>+9.1f}%"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test of the task management bot.")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=5000, help="rows pre-seeded in the fake sheet")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per fake model call")
+    parser.add_argument("--sheets-latency", type=float, default=0.05, help="seconds per fake Sheets request")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the scenario baseline")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    scenario = f"users={args.users},rounds={args.rounds},rows={args.rows},llm={args.llm_latency},sheets={args.sheets_latency}"
+    baselines = json.load(open(BASELINE_PATH)) if os.path.exists(BASELINE_PATH) else {}
+    result = asyncio.run(run(args))
+    report(scenario, result, baselines.get(scenario))
+
+    if args.save_baseline:
+        baselines[scenario] = {**result, "python": platform.python_version(), "machine": platform.machine()}
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {BASELINE_PATH}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
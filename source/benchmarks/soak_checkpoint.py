@@ -0,0 +1,61 @@
+"""
+Soak test for checkpoint memory growth.
+
+Replays synthetic multi-turn conversations through a small message graph and
+prints traced memory and checkpointer stats at regular intervals. With
+`BoundedInMemorySaver` memory plateaus; with `InMemorySaver` it keeps growing.
+
+Usage:
+    python benchmarks/soak_checkpoint.py [conversations] [--unbounded]
+"""
+import os
+import sys
+import asyncio
+import tracemalloc
+from loguru import logger
+from langchain_core.messages import AIMessage
+from langgraph.graph import StateGraph, MessagesState, START, END
+from langgraph.checkpoint.memory import InMemorySaver
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(path_this)
+sys.path.extend([path_root, path_this])
+
+from tools.checkpoint import BoundedInMemorySaver
+
+TURNS = 4
+
+async def echo(state: MessagesState) -> dict:
+    return {"messages": [AIMessage(content="OK " + state["messages"][-1].content)]}
+
+async def main():
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    conversations = int(args[0]) if args else 5000
+    if "--unbounded" in sys.argv:
+        saver = InMemorySaver()
+    else:
+        saver = BoundedInMemorySaver(max_checkpoints_per_thread=4, thread_ttl=0, max_bytes=8 * 1024 * 1024)
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("echo", echo)
+    builder.add_edge(START, "echo")
+    builder.add_edge("echo", END)
+    graph = builder.compile(checkpointer=saver)
+
+    tracemalloc.start()
+    report_every = max(1, conversations // 10)
+    for n in range(1, conversations + 1):
+        config = {"configurable": {"thread_id": f"soak-{n}"}}
+        for turn in range(TURNS):
+            message = f"user {n} turn {turn} " + "task " * 50
+            await graph.ainvoke({"messages": [{"role": "user", "content": message}]}, config)
+
+        if n % report_every == 0:
+            current, peak = tracemalloc.get_traced_memory()
+            stats = saver.stats() if hasattr(saver, "stats") else {}
+            print(f"{n:>7} conversations  traced={current / 2**20:8.2f} MiB  peak={peak / 2**20:8.2f} MiB  {stats}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
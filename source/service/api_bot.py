@@ -1,14 +1,13 @@
 import os
 import sys
 import asyncio
+from typing import *
 from loguru import logger
-from datetime import datetime
-from configparser import ConfigParser
-from langchain_openai.chat_models import ChatOpenAI
-from langgraph.checkpoint.memory import InMemorySaver
+from datetime import datetime, time as dtime
+from zoneinfo import ZoneInfo
 
 from telegram import Update, BotCommand
-from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, ContextTypes, filters
+from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, TypeHandler, ContextTypes, filters
 
 path_this = os.path.dirname(os.path.abspath(__file__))
 path_project = os.path.dirname(os.path.join(path_this, ".."))
@@ -17,26 +16,168 @@ sys.path.extend([path_root, path_project, path_this])
 
 from tools import (
     AgentTaskManagement,
-    SpreadsheetTool
+    BaseTaskManagement,
+    SpreadsheetTool,
+    TaskClassifier
 )
+from tools.task_parser import parse_task_message
+from tools.metrics import metrics
+from tools.settings import get_config
+from telegram_stream import TelegramStreamer
+from update_processor import ChatOrderedUpdateProcessor
+from digest import TeamDigest
 
-config = ConfigParser()
-config.read(os.path.join(path_root, "config.conf"))
+config = get_config()
 
-llm = ChatOpenAI(
-    api_key=config["llm"]["OPENAI_KEY"],
-    temperature=0.1,
-    model=config["llm"]["model_gpt"],
-    max_tokens=4000,
-    presence_penalty=0.8
-)
-memory = InMemorySaver()
-agent = AgentTaskManagement(
-    llm=llm,
-    checkpoint=memory
-)
-st = SpreadsheetTool()
+# Built on first use by the getters below, so importing this module neither
+# loads LangChain/OpenAI nor needs the API keys; assign them beforehand to
+# swap in other implementations.
+llm: Optional[Any] = None
+memory: Optional[Any] = None
+agent: Optional[AgentTaskManagement] = None
+classifier: Optional[TaskClassifier] = None
+st: Optional[SpreadsheetTool] = None
+digest: Optional[TeamDigest] = None
+
+def get_llm() -> Any:
+    global llm
+    if llm is None:
+        from langchain_openai.chat_models import ChatOpenAI
+        llm = ChatOpenAI(
+            api_key=config["llm"]["OPENAI_KEY"],
+            temperature=0.1,
+            model=config["llm"]["model_gpt"],
+            max_tokens=4000,
+            presence_penalty=0.8
+        )
+    return llm
+
+def get_classifier_llm() -> Any:
+    # one short structured answer per message: no need for the chat model's budget
+    from langchain_openai.chat_models import ChatOpenAI
+    return ChatOpenAI(
+        api_key=config["llm"]["OPENAI_KEY"],
+        temperature=0,
+        model=config.get("classifier", "model", fallback=config["llm"]["model_gpt"]),
+        max_tokens=config.getint("classifier", "max_tokens", fallback=256)
+    )
+
+def get_memory() -> Any:
+    global memory
+    if memory is None:
+        from tools.checkpoint import BoundedInMemorySaver, SQLiteSaver
+        if config.get("checkpoint", "backend", fallback="memory") == "sqlite":
+            memory = SQLiteSaver(
+                os.path.join(path_root, config.get("checkpoint", "sqlite_path", fallback="checkpoints.sqlite")),
+                batch_size=config.getint("checkpoint", "batch_size", fallback=32),
+                flush_interval=config.getfloat("checkpoint", "flush_interval", fallback=0.5),
+                max_checkpoints_per_thread=config.getint("checkpoint", "max_checkpoints_per_thread", fallback=10)
+            )
+        else:
+            memory = BoundedInMemorySaver(
+                max_checkpoints_per_thread=config.getint("checkpoint", "max_checkpoints_per_thread", fallback=10),
+                thread_ttl=config.getfloat("checkpoint", "thread_ttl", fallback=3600.0),
+                max_bytes=config.getint("checkpoint", "max_bytes", fallback=256 * 1024 * 1024)
+            )
+    return memory
+
+def get_agent() -> AgentTaskManagement:
+    global agent
+    if agent is None:
+        agent = AgentTaskManagement(
+            llm=get_llm(),
+            checkpoint=get_memory(),
+            classifier=get_classifier()
+        )
+    return agent
+
+def get_spreadsheet() -> SpreadsheetTool:
+    global st
+    if st is None:
+        st = SpreadsheetTool()
+    return st
+
+def get_classifier() -> TaskClassifier:
+    global classifier
+    if classifier is None:
+        classifier = TaskClassifier(
+            llm=get_classifier_llm(),
+            cache_size=config.getint("classifier", "cache_size", fallback=2048),
+            save_delay=config.getfloat("classifier", "save_delay", fallback=5.0),
+            cache_path=(
+                os.path.join(path_root, config["classifier"]["cache_path"])
+                if config.has_option("classifier", "cache_path") else None
+            )
+        )
+    return classifier
+
+def get_digest() -> TeamDigest:
+    global digest
+    if digest is None:
+        digest = TeamDigest(
+            get_spreadsheet(),
+            subscribers_path=os.path.join(path_root, config.get("digest", "subscribers_path", fallback="digest_subscribers.json")),
+            messages_per_second=config.getfloat("digest", "messages_per_second", fallback=25),
+            max_concurrency=config.getint("digest", "max_concurrency", fallback=10)
+        )
+    return digest
+
+streaming = config.getboolean("telegram", "streaming", fallback=False)
+stream_edit_interval = config.getfloat("telegram", "stream_edit_interval", fallback=1.5)
+
+metrics.enabled = config.getboolean("metrics", "enabled", fallback=False)
+
+def collect_gauges():
+    if SpreadsheetTool.scheduler is not None:
+        for kind, stats in SpreadsheetTool.scheduler.stats().items():
+            for key in ("queue_depth", "retries", "failures", "mean_wait_seconds"):
+                yield f"atm_sheets_{key}", {"kind": kind}, stats[key]
+    if SpreadsheetTool.task_cache is not None:
+        for key, value in SpreadsheetTool.task_cache.stats().items():
+            yield f"atm_task_cache_{key}", {}, value
+    if classifier is not None:
+        for key, value in classifier.stats().items():
+            yield f"atm_classifier_cache_{key}", {}, value
+    if memory is not None:
+        from tools.checkpoint import BoundedInMemorySaver
+        if isinstance(memory, BoundedInMemorySaver):
+            for key, value in memory.stats().items():
+                yield f"atm_checkpoint_{key}", {}, value
+
+metrics.add_collector(collect_gauges)
+
+def thread_id_of(update: Update) -> str:
+    """
+    Build the agent conversation thread ID for a Telegram update.
 
+    One thread per user per chat, so group members do not share history.
+    """
+    return f"tg-{update.effective_chat.id}-{update.effective_user.id}"
+
+async def run_agent(update: Update, command: str, error_message: str):
+    """
+    Run the agent for an update and reply with its answer. With streaming
+    enabled the reply is a placeholder edited as the answer is generated.
+    """
+    streamer = TelegramStreamer(update.message, min_interval=stream_edit_interval) if streaming else None
+    try:
+        if streamer is not None:
+            await streamer.start()
+        response = await get_agent()._run(
+            command,
+            thread_id=thread_id_of(update),
+            on_token=streamer.push if streamer is not None else None
+        )
+    except Exception as e:
+        logger.error(f"OpenAI error: {e}")
+        response = error_message
+
+    if streamer is not None and streamer.reply is not None:
+        await streamer.finish(response)
+    else:
+        await update.message.reply_text(response)
+
+@metrics.timed("telegram.start")
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(
         "👋 Halo! Saya bot task management.\n\n"
@@ -47,6 +188,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "Task Anda akan otomatis saya simpan ke spreadsheet. 🚀"
     )
 
+@metrics.timed("telegram.info")
 async def info(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(
         "ℹ️ Info Bot Task Management\n\n"
@@ -60,31 +202,86 @@ async def info(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "- /start → Memulai percakapan dengan bot\n"
         "- /info → Melihat informasi & panduan penggunaan\n"
         "- /chat → Chat langsung dengan bot\n"
-        "- /check_task → Mengecek apakah masih ada task yang belum selesai\n\n"
+        "- /check_task → Mengecek apakah masih ada task yang belum selesai\n"
+        "- /done → Menandai task selesai, contoh: /done Adjust Network Cognitive Warfare, Bug Fixing\n"
+        "- /team_tasks → Melihat jumlah task yang belum selesai di seluruh tim\n\n"
         "Bot ini terhubung dengan Google Spreadsheet untuk menyimpan semua task.\n"
         "Apabila ada kendala hubungi admin: @FakhriMN25"
     )
 
+@metrics.timed("telegram.add_task")
 async def add_task(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.message.from_user.first_name
     task_text = update.message.text
     timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
 
+    # --- Format "Project | Task | Assignor" langsung ke spreadsheet ---
+    payload = parse_task_message(task_text, user)
+    if payload is not None:
+        try:
+            payload.task = await get_classifier().classify(payload.sub_task)
+        except Exception as e:
+            logger.warning(f"Task classification failed, falling back to agent: {e}")
+            payload = None
+
+    if payload is not None:
+        try:
+            response = await get_spreadsheet().input_task_management(**payload.model_dump())
+        except Exception as e:
+            logger.error(f"Spreadsheet error: {e}")
+            response = (
+                "❌ Maaf, terjadi kesalahan saat menyimpan task.\n"
+                "Silakan coba lagi nanti atau hubungi admin: @FakhriMN25"
+            )
+        await update.message.reply_text(response)
+        return
+
     # --- OpenAI untuk analisis task ---
+    await run_agent(
+        update,
+        f"{user}: {task_text}",
+        "Maaf Saat ini saya sedang terkendala sesuatu, mohon coba sesaat lagi. apabila ini terus berlangsung tolong hubungi @FakhriMN25"
+    )
+
+@metrics.timed("telegram.check_task")
+async def check_task(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    user = update.message.from_user.first_name
     try:
-        response = await agent._run(f"{user}: {task_text}")
+        result = await get_spreadsheet().get_undone_task(user)
     except Exception as e:
-        logger.error(f"OpenAI error: {e}")
-        response = "Maaf Saat ini saya sedang terkendala sesuatu, mohon coba sesaat lagi. apabila ini terus berlangsung tolong hubungi @FakhriMN25"
+        logger.error(f"Spreadsheet error: {e}")
+        result = (
+            "❌ Maaf, terjadi kesalahan saat mengambil data task.\n"
+            "Silakan coba lagi nanti atau hubungi admin: @FakhriMN25"
+        )
 
-    await update.message.reply_text(
-        response
-    )
+    await update.message.reply_text(result)
 
-async def check_task(update: Update, context: ContextTypes.DEFAULT_TYPE):
+@metrics.timed("telegram.done")
+async def done(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.message.from_user.first_name
+    done_text = update.message.text.split(maxsplit=1)
+    sub_tasks = [sub.strip() for sub in done_text[1].split(",") if sub.strip()] if len(done_text) > 1 else []
+
+    if not sub_tasks:
+        await update.message.reply_text("❌ Tolong masukkan task setelah /done, pisahkan dengan koma.")
+        return
+
     try:
-        result = await st.get_undone_task(user)
+        result = await get_spreadsheet().update_task_status(user, sub_tasks)
+    except Exception as e:
+        logger.error(f"Spreadsheet error: {e}")
+        result = (
+            "❌ Maaf, terjadi kesalahan saat mengupdate task.\n"
+            "Silakan coba lagi nanti atau hubungi admin: @FakhriMN25"
+        )
+
+    await update.message.reply_text(result)
+
+@metrics.timed("telegram.team_tasks")
+async def team_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    try:
+        result = await get_digest().summary()
     except Exception as e:
         logger.error(f"Spreadsheet error: {e}")
         result = (
@@ -94,6 +291,20 @@ async def check_task(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     await update.message.reply_text(result)
 
+async def remember_user(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    Subscribe users who talk to the bot privately to the team digest.
+    """
+    if update.effective_chat is not None and update.effective_chat.type == "private" and update.effective_user is not None:
+        await get_digest().subscribe(update.effective_user.first_name, update.effective_chat.id)
+
+async def send_digest(context: ContextTypes.DEFAULT_TYPE):
+    try:
+        await get_digest().send(context.bot)
+    except Exception as e:
+        logger.error(f"Team digest failed: {e}")
+
+@metrics.timed("telegram.chat")
 async def chat(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.message.from_user.first_name
     chat_text = update.message.text.replace("/chat", "", 1).strip()
@@ -102,36 +313,108 @@ async def chat(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("❌ Tolong masukkan pesan setelah /chat.")
         return
 
-    try:
-        response = await agent._run(f"{user}: {chat_text}")
-    except Exception as e:
-        logger.error(f"OpenAI error: {e}")
-        response = (
+    await run_agent(
+        update,
+        f"{user}: {chat_text}",
+        (
             "Maaf, saya sedang mengalami kendala. "
             "Coba lagi nanti atau hubungi admin: @FakhriMN25"
         )
-
-    await update.message.reply_text(response)    
+    )
 
 async def set_commands(app):
     commands = [
         BotCommand("start", "add task"),
         BotCommand("info", "info"),
         BotCommand("check_task", "check task"),
+        BotCommand("done", "mark task as done"),
+        BotCommand("team_tasks", "team undone tasks"),
         BotCommand("chat", "chat with bot")
     ]
     await app.bot.set_my_commands(commands)
 
-def main():
+async def post_init(app):
+    await BaseTaskManagement.open_session(
+        limit=config.getint("http", "limit", fallback=100),
+        limit_per_host=config.getint("http", "limit_per_host", fallback=20),
+        ttl_dns_cache=config.getint("http", "ttl_dns_cache", fallback=300),
+        retries=config.getint("http", "retries", fallback=0),
+        max_backoff=config.getfloat("http", "max_backoff", fallback=8.0)
+    )
+    await set_commands(app)
+    if metrics.enabled and config.has_option("metrics", "port"):
+        await metrics.start_server(
+            host=config.get("metrics", "host", fallback="127.0.0.1"),
+            port=config.getint("metrics", "port")
+        )
+
+async def shutdown(app):
+    await metrics.stop_server()
+    await BaseTaskManagement.close_session()
+    await SpreadsheetTool.close()
+    if classifier is not None:
+        await classifier.flush()
+    if memory is not None:
+        from tools.checkpoint import SQLiteSaver
+        if isinstance(memory, SQLiteSaver):
+            memory.close()
+
+def build_application(updater: bool = True):
+    """
+    Build the Telegram application with every bot handler registered.
+
+    Args:
+        updater (bool): Attach the polling updater. Webhook mode passes
+            False and feeds updates into `update_queue` itself.
+    """
     token = config["default"]["TELEGRAM_TOKEN"]
-    app = ApplicationBuilder().token(token).post_init(set_commands).build()
+    update_processor = ChatOrderedUpdateProcessor(
+        max_concurrent_updates=config.getint("telegram", "concurrent_updates", fallback=8),
+        priority_commands=[
+            command.strip() for command in
+            config.get("telegram", "priority_commands", fallback="start,info").split(",") if command.strip()
+        ],
+        priority_concurrency=config.getint("telegram", "priority_concurrency", fallback=4),
+        max_pending_updates=config.getint("telegram", "max_pending_updates", fallback=1024)
+    )
+    builder = (
+        ApplicationBuilder()
+        .token(token)
+        .concurrent_updates(update_processor)
+        .post_init(post_init)
+        .post_shutdown(shutdown)
+    )
+    if not updater:
+        builder = builder.updater(None)
+    app = builder.build()
 
     app.add_handler(CommandHandler("start", start))
     app.add_handler(CommandHandler("info", info))
     app.add_handler(CommandHandler("check_task", check_task))
+    app.add_handler(CommandHandler("done", done))
     app.add_handler(CommandHandler("chat", chat))
+    app.add_handler(CommandHandler("team_tasks", team_tasks))
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, add_task))
 
+    if config.getboolean("digest", "enabled", fallback=False):
+        # every process records subscribers, whichever one sends the digest
+        app.add_handler(TypeHandler(Update, remember_user), group=-1)
+        if app.job_queue is None:
+            logger.warning("Team digest enabled but the job queue is unavailable, install python-telegram-bot[job-queue]")
+        elif not get_digest().claim(os.path.join(path_root, config.get("digest", "lock_path", fallback="digest.lock"))):
+            logger.info("Team digest is sent by another process")
+        else:
+            hour, minute = (int(part) for part in config.get("digest", "time", fallback="09:00").split(":"))
+            app.job_queue.run_daily(
+                send_digest,
+                time=dtime(hour, minute, tzinfo=ZoneInfo(config.get("digest", "timezone", fallback="Asia/Jakarta"))),
+                days=tuple(int(day) for day in config.get("digest", "days", fallback="1,2,3,4,5").split(",")),
+                name="team_digest"
+            )
+    return app
+
+def main():
+    app = build_application()
     logger.info("🤖 Bot task management sudah berjalan...")
     app.run_polling()
 
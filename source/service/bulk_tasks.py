@@ -0,0 +1,60 @@
+"""
+Bulk import and export of the task sheet.
+
+Usage:
+    python service/bulk_tasks.py import tasks.csv [--chunk-size 1000] [--progress FILE] [--restart]
+    python service/bulk_tasks.py export tasks.jsonl [--page-size 5000]
+
+Imports read a `.csv` (header: name, project_name, task, sub_task, assignor)
+or `.jsonl` file with the same keys; interrupted imports resume from the
+progress file without appending a chunk twice. Exports write every sheet
+column of the data rows, skipping the sheet's header row.
+"""
+import os
+import sys
+import asyncio
+import argparse
+import resource
+from loguru import logger
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_project = os.path.dirname(os.path.join(path_this, ".."))
+path_root = os.path.dirname(os.path.join(path_this, "../.."))
+sys.path.extend([path_root, path_project, path_this])
+
+from tools import SpreadsheetTool
+from tools.bulk import export_tasks, import_tasks
+
+async def run(args: argparse.Namespace) -> dict:
+    st = SpreadsheetTool()
+    try:
+        if args.command == "import":
+            return await import_tasks(st, args.path, chunk_size=args.chunk_size, progress_path=args.progress, restart=args.restart)
+        return await export_tasks(st, args.path, page_size=args.page_size)
+    finally:
+        await SpreadsheetTool.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import/export of the task sheet.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="append tasks from a CSV or JSONL file")
+    importer.add_argument("path")
+    importer.add_argument("--chunk-size", type=int, default=1000, help="rows per append request")
+    importer.add_argument("--progress", help="progress file, <path>.progress by default")
+    importer.add_argument("--restart", action="store_true", help="ignore saved progress")
+    exporter = commands.add_parser("export", help="write the sheet to a CSV or JSONL file")
+    exporter.add_argument("path")
+    exporter.add_argument("--page-size", type=int, default=5000, help="rows per read request")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    seconds = result["seconds"]
+    rows = result["rows"]
+    logger.info(
+        f"{args.command}: {rows} row(s) in {seconds:.1f}s ({rows / seconds if seconds else 0:.0f} rows/s), "
+        f"{result['requests']} request(s), peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB"
+        + (f", {result['rejected']} rejected" if "rejected" in result else "")
+    )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
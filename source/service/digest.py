@@ -0,0 +1,179 @@
+import os
+import fcntl
+import srsly
+import asyncio
+from typing import *
+from loguru import logger
+from telegram import Bot
+from telegram.error import Forbidden, RetryAfter, TelegramError
+
+from tools import SpreadsheetTool
+from tools.scheduler import TokenBucket
+from tools.task_cache import TaskCache
+
+class TeamDigest:
+    """
+    Team-wide reminder of undone tasks, built from one read of the sheet.
+
+    Users are subscribed when they message the bot in a private chat: their
+    first name (the assignee name the bot writes to the sheet) is mapped to
+    the chat ID, optionally persisted as JSON at `subscribers_path`. Every
+    change re-reads and rewrites the file under a file lock, so processes
+    sharing it (webhook workers) merge their subscriptions. `send`
+    reads the sheet once, groups undone rows by assignee and messages every
+    subscriber with open tasks concurrently, paced by a token bucket to
+    stay inside Telegram's broadcast limits. Only the process holding the
+    lock taken by `claim` should schedule it.
+
+    Args:
+        spreadsheet (SpreadsheetTool): Source of the task rows.
+        subscribers_path (str, optional): JSON file for the subscriber registry.
+        messages_per_second (float): Broadcast rate.
+        max_concurrency (int): Messages in flight at once.
+    """
+
+    MAX_LENGTH: ClassVar[int] = 4096
+
+    def __init__(
+            self,
+            spreadsheet: SpreadsheetTool,
+            subscribers_path: Optional[str] = None,
+            messages_per_second: float = 25,
+            max_concurrency: int = 10
+        ):
+        self.spreadsheet = spreadsheet
+        self.subscribers_path = subscribers_path
+        self.messages_per_second = messages_per_second
+        self.max_concurrency = max_concurrency
+        self.subscribers: Dict[str, int] = self._read()
+        self._leader_lock: Optional[IO] = None
+        if self.subscribers:
+            logger.info(f"Loaded {len(self.subscribers)} digest subscriber(s)")
+
+    def claim(self, lock_path: str) -> bool:
+        """
+        Try to become the one process that sends the digest, by holding an
+        exclusive lock on `lock_path` for the rest of its life. Returns
+        False when another process (e.g. another webhook worker) holds it.
+        """
+        if self._leader_lock is not None:
+            return True
+        lock = open(lock_path, "a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return False
+        self._leader_lock = lock
+        return True
+
+    async def subscribe(self, name: str, chat_id: int) -> None:
+        key = TaskCache.key(name)
+        if not key or self.subscribers.get(key) == chat_id:
+            return
+        self.subscribers[key] = chat_id
+        await self._save(key, chat_id)
+
+    async def unsubscribe(self, name: str) -> None:
+        key = TaskCache.key(name)
+        if self.subscribers.pop(key, None) is not None:
+            await self._save(key, None)
+
+    def _read(self) -> Dict[str, int]:
+        if not self.subscribers_path or not os.path.exists(self.subscribers_path):
+            return {}
+        try:
+            return {key: int(chat_id) for key, chat_id in srsly.read_json(self.subscribers_path).items()}
+        except Exception as e:
+            logger.warning(f"Could not load digest subscribers {self.subscribers_path}: {str(e)}")
+            return {}
+
+    def _write(self, key: str, chat_id: Optional[int]) -> Dict[str, int]:
+        # merge into the file as it is now, so changes made by other
+        # processes since this one last read it are kept
+        with open(f"{self.subscribers_path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            subscribers = self._read()
+            if chat_id is None:
+                subscribers.pop(key, None)
+            else:
+                subscribers[key] = chat_id
+            tmp = f"{self.subscribers_path}.tmp"
+            srsly.write_json(tmp, subscribers)
+            os.replace(tmp, self.subscribers_path)
+        return subscribers
+
+    async def _save(self, key: str, chat_id: Optional[int]) -> None:
+        if self.subscribers_path:
+            self.subscribers = await asyncio.to_thread(self._write, key, chat_id)
+
+    async def summary(self) -> str:
+        """
+        Return undone-task counts per assignee for the whole team, read from
+        the columnar task table.
+        """
+        table = await self.spreadsheet.get_task_table()
+        team = table.open_by("assignee")
+        if not team:
+            return "✅ Tidak ada task yang belum selesai di tim.\n\nKEEP IT THE GOOD WORK 👍"
+
+        lines = [
+            f"- {name}: {count} task"
+            for name, count in sorted(team.items(), key=lambda item: (-item[1], item[0].lower()))
+        ]
+        return self._truncate(
+            f"📋 Terdapat {sum(team.values())} task yang belum selesai dari {len(team)} orang:\n\n" + "\n".join(lines)
+        )
+
+    async def send(self, bot: Bot) -> Dict[str, int]:
+        """
+        Message every subscriber who still has undone tasks.
+
+        Returns:
+            dict: Number of messages `sent` and `failed`, and subscribers
+                `skipped` because they have no undone tasks.
+        """
+        if self.subscribers_path:
+            # pick up subscriptions recorded by other processes
+            self.subscribers = await asyncio.to_thread(self._read)
+        team = await self.spreadsheet.get_team_undone_tasks()
+        bucket = TokenBucket(self.messages_per_second * 60, self.messages_per_second)
+        slots = asyncio.Semaphore(self.max_concurrency)
+        counters = {"sent": 0, "failed": 0, "skipped": 0}
+        by_key = {TaskCache.key(name): (name, rows) for name, rows in team.items()}
+
+        async def deliver(key: str, chat_id: int) -> None:
+            if key not in by_key:
+                counters["skipped"] += 1
+                return
+            name, rows = by_key[key]
+            text = self._truncate(self.spreadsheet.format_undone(name, rows))
+            async with slots:
+                for attempt in range(2):
+                    delay = bucket.reserve()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    try:
+                        await bot.send_message(chat_id=chat_id, text=text)
+                        counters["sent"] += 1
+                        return
+                    except RetryAfter as e:
+                        if attempt == 0:
+                            retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else e.retry_after
+                            await asyncio.sleep(retry_after)
+                            continue
+                        logger.warning(f"Digest to {name} throttled twice, giving up")
+                    except Forbidden:
+                        logger.info(f"{name} blocked the bot, unsubscribing from digest")
+                        await self.unsubscribe(key)
+                    except TelegramError as e:
+                        logger.warning(f"Digest to {name} failed: {str(e)}")
+                    counters["failed"] += 1
+                    return
+
+        await asyncio.gather(*(deliver(key, chat_id) for key, chat_id in list(self.subscribers.items())))
+        logger.info(f"Team digest: {counters['sent']} sent, {counters['failed']} failed, {counters['skipped']} without undone tasks")
+        return counters
+
+    def _truncate(self, text: str) -> str:
+        return text if len(text) <= self.MAX_LENGTH else text[:self.MAX_LENGTH - 1] + "…"
\ No newline at end of file
@@ -0,0 +1,84 @@
+import time
+import asyncio
+from typing import *
+from loguru import logger
+from telegram import Message
+from telegram.error import BadRequest, RetryAfter
+
+class TelegramStreamer:
+    """
+    Shows a streamed agent reply by editing one Telegram message in place.
+
+    A placeholder is sent first, then edited with the accumulated text at
+    most once every `min_interval` seconds to stay inside Telegram's edit
+    rate limits. When the model starts a new message (e.g. after a tool
+    call) the text starts over.
+
+    Args:
+        message (Message): The user's message to reply to.
+        min_interval (float): Minimum seconds between edits.
+        placeholder (str): Text shown until the first chunk arrives.
+    """
+
+    MAX_LENGTH: ClassVar[int] = 4096
+
+    def __init__(self, message: Message, min_interval: float = 1.5, placeholder: str = "⏳ Sedang diproses..."):
+        self.message = message
+        self.min_interval = min_interval
+        self.placeholder = placeholder
+        self.reply: Optional[Message] = None
+        self.text = ""
+        self.shown = ""
+        self.message_id: Optional[str] = None
+        self.next_edit_at = 0.0
+
+    async def start(self) -> None:
+        self.reply = await self.message.reply_text(self.placeholder)
+        self.shown = self.placeholder
+        self.next_edit_at = time.monotonic() + self.min_interval
+
+    async def push(self, text: str, message_id: Optional[str] = None) -> None:
+        """
+        Add a streamed chunk and edit the reply if the throttle allows.
+        """
+        if message_id != self.message_id:
+            self.message_id = message_id
+            self.text = ""
+        self.text += text
+        if time.monotonic() >= self.next_edit_at:
+            await self._edit(self.text[:self.MAX_LENGTH - 1] + "…" if len(self.text) >= self.MAX_LENGTH else self.text + " ▌")
+
+    async def finish(self, text: Optional[str]) -> None:
+        """
+        Replace the reply with the final answer, splitting it into several
+        messages if it is longer than Telegram allows.
+        """
+        text = text or self.text or "-"
+        parts = [text[i:i + self.MAX_LENGTH] for i in range(0, len(text), self.MAX_LENGTH)]
+        if self.reply is None:
+            self.reply = await self.message.reply_text(parts[0])
+        else:
+            self.next_edit_at = 0.0
+            await self._edit(parts[0], final=True)
+        for part in parts[1:]:
+            await self.message.reply_text(part)
+
+    async def _edit(self, text: str, final: bool = False) -> None:
+        if text == self.shown:
+            return
+        delay = self.min_interval
+        try:
+            await self.reply.edit_text(text)
+            self.shown = text
+        except RetryAfter as e:
+            retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else float(e.retry_after)
+            logger.warning(f"Telegram edit throttled, retry after {retry_after}s")
+            if final:
+                await asyncio.sleep(retry_after)
+                await self.reply.edit_text(text)
+                self.shown = text
+            delay = max(delay, retry_after)
+        except BadRequest as e:
+            if "not modified" not in str(e).lower():
+                raise
+        self.next_edit_at = time.monotonic() + delay
@@ -0,0 +1,81 @@
+import asyncio
+import weakref
+from typing import *
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """
+    Processes updates concurrently while keeping each chat's updates in
+    arrival order.
+
+    At most `max_concurrent_updates` regular updates run at once, and an
+    update only starts after the previous update of the same chat has
+    finished. Commands listed in `priority_commands` (e.g. /start, /info)
+    skip both the chat queue and the global cap and run on their own
+    `priority_concurrency` slots, so they never wait behind agent runs.
+
+    Args:
+        max_concurrent_updates (int): Regular updates processed at once.
+        priority_commands (Iterable[str]): Command names without the slash.
+        priority_concurrency (int): Priority updates processed at once.
+        max_pending_updates (int): Updates accepted at once, running or
+            waiting for their turn, before the application stops reading
+            new ones.
+    """
+
+    def __init__(
+            self,
+            max_concurrent_updates: int = 8,
+            priority_commands: Iterable[str] = ("start", "info"),
+            priority_concurrency: int = 4,
+            max_pending_updates: int = 1024
+        ):
+        super().__init__(max(max_pending_updates, max_concurrent_updates + priority_concurrency))
+        self.priority_commands = {command.lower() for command in priority_commands}
+        self._regular = asyncio.Semaphore(max_concurrent_updates)
+        self._priority = asyncio.Semaphore(priority_concurrency)
+        self._chat_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def is_priority(self, update: object) -> bool:
+        if not isinstance(update, Update) or update.effective_message is None:
+            return False
+        text = update.effective_message.text or ""
+        if not text.startswith("/"):
+            return False
+        parts = text[1:].split(maxsplit=1)
+        # "/info@SomeBot" in groups addresses the command to a specific bot
+        return bool(parts) and parts[0].split("@", 1)[0].lower() in self.priority_commands
+
+    def _chat_lock(self, update: object) -> Optional[asyncio.Lock]:
+        chat = update.effective_chat if isinstance(update, Update) else None
+        if chat is None:
+            return None
+        lock = self._chat_locks.get(chat.id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._chat_locks[chat.id] = lock
+        return lock
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        if self.is_priority(update):
+            async with self._priority:
+                await coroutine
+            return
+
+        lock = self._chat_lock(update)
+        if lock is None:
+            async with self._regular:
+                await coroutine
+            return
+
+        # asyncio.Lock wakes waiters first-in first-out, so the chat's updates keep their order
+        async with lock:
+            async with self._regular:
+                await coroutine
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
\ No newline at end of file
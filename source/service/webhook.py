@@ -0,0 +1,136 @@
+"""
+Webhook entry point: Telegram POSTs each update to `[webhook] path` and it
+is queued into the same application and handlers used by polling mode.
+`/healthz` reports readiness; `/metrics` answers loopback clients only.
+More than one `[webhook] workers` requires `[checkpoint] backend = sqlite`.
+`[webhook] secret_token` is required: without it anyone who finds the URL
+could post forged updates.
+
+Run with `python service/webhook.py`. A recorded update can be replayed
+locally with:
+
+    curl -X POST localhost:8000/telegram \\
+        -H "Content-Type: application/json" \\
+        -H "X-Telegram-Bot-Api-Secret-Token: <secret_token>" \\
+        -d @update.json
+"""
+
+import os
+import sys
+import hmac
+import uvicorn
+import ipaddress
+from loguru import logger
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from telegram import Update
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_project = os.path.dirname(os.path.join(path_this, ".."))
+path_root = os.path.dirname(os.path.join(path_this, "../.."))
+sys.path.extend([path_root, path_project, path_this])
+
+from api_bot import build_application, config
+from tools.metrics import metrics
+
+WEBHOOK_PATH = config.get("webhook", "path", fallback="/telegram")
+SECRET_TOKEN = config.get("webhook", "secret_token", fallback="") or None
+MISSING_SECRET = "[webhook] secret_token is not set; refusing to accept updates without it"
+
+application = build_application(updater=False)
+
+@asynccontextmanager
+async def lifespan(api: FastAPI):
+    if SECRET_TOKEN is None:
+        raise RuntimeError(MISSING_SECRET)
+    await application.initialize()
+    if application.post_init:
+        await application.post_init(application)
+
+    url = config.get("webhook", "url", fallback="")
+    if url and config.getboolean("webhook", "set_webhook", fallback=True):
+        await application.bot.set_webhook(
+            url=url.rstrip("/") + WEBHOOK_PATH,
+            secret_token=SECRET_TOKEN,
+            allowed_updates=Update.ALL_TYPES
+        )
+        logger.info(f"Telegram webhook set to {url.rstrip('/') + WEBHOOK_PATH}")
+
+    await application.start()
+    logger.info("🤖 Bot task management sudah berjalan (webhook)...")
+    try:
+        yield
+    finally:
+        # stop() processes every queued update and waits for running handlers,
+        # so agent runs in flight finish and reply before the worker exits
+        logger.info(f"Draining {application.update_queue.qsize()} queued update(s)")
+        await application.stop()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
+        await application.shutdown()
+        logger.info("Bot task management stopped")
+
+app = FastAPI(lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+
+@app.post(WEBHOOK_PATH)
+async def telegram_webhook(request: Request) -> Response:
+    if SECRET_TOKEN is None or not hmac.compare_digest(
+        request.headers.get("X-Telegram-Bot-Api-Secret-Token", ""), SECRET_TOKEN
+    ):
+        return Response(status_code=403)
+    if not application.running:
+        # let Telegram redeliver to a replica that is not shutting down
+        return Response(status_code=503)
+
+    try:
+        update = Update.de_json(await request.json(), application.bot)
+    except Exception as e:
+        logger.warning(f"Invalid Telegram update: {e}")
+        return Response(status_code=400)
+
+    await application.update_queue.put(update)
+    return Response(status_code=200)
+
+@app.get("/healthz")
+async def healthz() -> JSONResponse:
+    return JSONResponse(
+        {"status": "ok" if application.running else "stopping", "queued_updates": application.update_queue.qsize()},
+        status_code=200 if application.running else 503
+    )
+
+@app.get("/metrics")
+async def metrics_endpoint(request: Request) -> Response:
+    # the webhook listens publicly; metrics are for local scrapers only
+    try:
+        local = request.client is not None and ipaddress.ip_address(request.client.host).is_loopback
+    except ValueError:
+        local = False
+    if not local:
+        return Response(status_code=404)
+    return PlainTextResponse(metrics.render())
+
+def serve():
+    if SECRET_TOKEN is None:
+        raise SystemExit(MISSING_SECRET)
+    workers = config.getint("webhook", "workers", fallback=1)
+    if workers > 1:
+        # conversation memory, per-chat ordering and per-thread locks live in
+        # one process, so workers would each see only part of a conversation
+        if config.get("checkpoint", "backend", fallback="memory") == "memory":
+            raise SystemExit(
+                "[webhook] workers > 1 needs a shared checkpointer; set [checkpoint] backend = sqlite or use one worker"
+            )
+        logger.warning(f"Running {workers} webhook workers: updates of one chat are only ordered within a worker")
+    uvicorn.run(
+        "webhook:app",
+        app_dir=path_this,
+        host=config.get("webhook", "host", fallback="0.0.0.0"),
+        port=config.getint("webhook", "port", fallback=8000),
+        workers=workers,
+        timeout_graceful_shutdown=config.getint("webhook", "drain_timeout", fallback=60)
+    )
+
+if __name__ == "__main__":
+    serve()
\ No newline at end of file
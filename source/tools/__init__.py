@@ -1,3 +1,26 @@
-from tools.base import BaseTaskManagement
-from tools.spreadsheet import SpreadsheetTool
-from tools.agent import AgentTaskManagement
\ No newline at end of file
+import importlib
+from typing import *
+
+# Tools are imported on first attribute access, so importing one of them
+# (or `tools.metrics`) does not pull in LangChain, LangGraph and the
+# Google API client for the others.
+_EXPORTS: Dict[str, str] = {
+    "BaseTaskManagement": "tools.base",
+    "BoundedInMemorySaver": "tools.checkpoint",
+    "SQLiteSaver": "tools.checkpoint",
+    "SpreadsheetTool": "tools.spreadsheet",
+    "AgentTaskManagement": "tools.agent",
+    "TaskClassifier": "tools.classifier",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_EXPORTS])
\ No newline at end of file
@@ -1,12 +1,10 @@
 import os
 import sys
-import srsly
+import asyncio
+import weakref
 from typing import *
-from configparser import ConfigParser
-from langchain_core.messages import BaseMessage
-from langchain.tools.base import StructuredTool
-from langgraph.prebuilt import create_react_agent
-from langchain.schema.runnable.config import RunnableConfig
+from loguru import logger
+from pydantic import Field, PrivateAttr
 
 path_this = os.path.dirname(os.path.abspath(__file__))
 path_project = os.path.dirname(os.path.join(path_this, ".."))
@@ -14,70 +12,91 @@ path_root = os.path.dirname(os.path.join(path_this, "../.."))
 sys.path.extend([path_root, path_project, path_this])
 
 from tools import (
-    BaseTaskManagement, 
+    BaseTaskManagement,
     SpreadsheetTool
 )
+from tools.metrics import metrics
+from tools.settings import CONFIG_PATH, get_config, reload_config
 from tools.utils import (
     ATMFormat,
-    CTMFormat
+    CTMFormat,
+    UTSFormat
 )
 
 class AgentTaskManagement(BaseTaskManagement):
     """
+    ReAct agent for task management backed by Google Spreadsheet tools.
+
+    The compiled agent graph, its tools and the system prompt are built lazily
+    on first use and reused for every message. They are rebuilt only when the
+    modification time of `config.conf` or the prompt file changes.
+
+    Before each model step the history is trimmed to the newest messages
+    fitting `context_tokens` tokens (`[agent] context_tokens` in `config.conf`,
+    re-read with the rest of the config unless given explicitly).
+
+    When a `classifier` (`TaskClassifier`) is given, `add_task_management`
+    stores the categories it assigns instead of the ones the model picked,
+    so tasks added through the agent are categorized like the ones parsed
+    directly from the "Project | Task | Assignor" format.
+
+    LangChain and LangGraph are imported when the graph is first compiled,
+    not when this module is imported.
     """
 
-    config: ClassVar[ConfigParser] = ConfigParser()
-    config.read(os.path.join(path_root, "config.conf"))
+    config_path: ClassVar[str] = CONFIG_PATH
 
     llm: Any
     checkpoint: Optional[Any] = None
-
-    async def _run(self, command: str, callbacks: list = []):
+    classifier: Optional[Any] = None
+    context_tokens: int = Field(default_factory=lambda: get_config().getint("agent", "context_tokens", fallback=3000))
+
+    _executor: Optional[Any] = PrivateAttr(default=None)
+    _signature: Optional[Tuple[float, float]] = PrivateAttr(default=None)
+    _trimmer: Optional[Any] = PrivateAttr(default=None)
+    _thread_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = PrivateAttr(
+        default_factory=weakref.WeakValueDictionary
+    )
+
+    @staticmethod
+    def _mtime(path: str) -> float:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0.0
+
+    def _prompt_path(self) -> str:
+        return os.path.join(path_root, get_config()["default"]["agent_system_messages_path_general"])
+
+    def _build_tools(self) -> List[Any]:
         """
-        Execute the agent using a natural language command as input.
-
-        Args:
-            command (str): The natural language input/query to process.
+        Create the structured tools exposed to the agent.
 
         Returns:
-            dict: The final result from the agent after processing the command.
+            List[StructuredTool]: Tools bound to a single `SpreadsheetTool` instance.
         """
-        async def pre_model_hook(state: dict, **kwargs) -> dict:
-            """
-            Hook executed before model inference. Prepares a list of recent messages
-            for use as input to the language model.
-
-            Args:
-                state (dict): The current agent state including full message history.
-                **kwargs: Additional optional keyword arguments.
-
-            Returns:
-                dict: Dictionary with key 'llm_input_messages' containing recent messages.
-            """
-            messages: List[BaseMessage] = state["messages"]
-
-            cleaned_messages = []
-            i = 0
-            while i < len(messages):
-                msg = messages[i]
-
-                if msg.type == "assistant" and getattr(msg, "tool_calls", None):
-                    cleaned_messages.append(msg)
-                    if i + 1 < len(messages) and messages[i + 1].type == "tool":
-                        cleaned_messages.append(messages[i + 1])
-                        i += 1 
-                elif msg.type in ["user", "assistant"]:
-                    cleaned_messages.append(msg)
-                i += 1
-
-            last_messages = cleaned_messages[-6:] if len(cleaned_messages) > 6 else cleaned_messages
-            return {"llm_input_messages": last_messages}
+        from langchain.tools.base import StructuredTool
 
         task_management = SpreadsheetTool()
-        tools = [
+
+        async def add_task_management(
+                name: List[str],
+                project_name: List[str],
+                task: List[str],
+                sub_task: List[str],
+                assignor: List[Optional[str]]
+            ) -> str:
+            if self.classifier is not None:
+                try:
+                    task = await self.classifier.classify(sub_task)
+                except Exception as e:
+                    logger.warning(f"Task classification failed, keeping the agent's categories: {e}")
+            return await task_management.input_task_management(name, project_name, task, sub_task, assignor)
+
+        return [
             StructuredTool.from_function(
                 name="add_task_management",
-                func=task_management.input_task_management,
+                func=add_task_management,
                 description=(
                     "Tool for adding task management entries to Google Spreadsheet.\n\n"
                     "Expected input fields:\n"
@@ -90,7 +109,7 @@ class AgentTaskManagement(BaseTaskManagement):
                     "- assignor: List[Optional[str]] → List of assignors (task givers). "
                     "Can be null if not specified."
                 ),
-                coroutine=task_management.input_task_management,
+                coroutine=add_task_management,
                 args_schema=ATMFormat
             ),
             StructuredTool.from_function(
@@ -102,26 +121,132 @@ class AgentTaskManagement(BaseTaskManagement):
                 ),
                 coroutine=task_management.get_undone_task,
                 args_schema=CTMFormat
+            ),
+            StructuredTool.from_function(
+                name="update_task_status",
+                func=task_management.update_task_status,
+                description=(
+                    "Tool to update the status of a user's unfinished tasks, "
+                    "e.g. mark them as done.\n\n"
+                    "Expected input fields:\n"
+                    "- name: str → The user's name (assignee).\n"
+                    "- sub_tasks: List[str] → The sub-tasks to update.\n"
+                    "- status: str → The new status, default 'done'."
+                ),
+                coroutine=task_management.update_task_status,
+                args_schema=UTSFormat
             )
         ]
 
-        path_json = os.path.join(path_root, self.config["default"]["agent_system_messages_path_general"])
-        prompts = srsly.read_json(path_json)
-        agent_executor = create_react_agent(
+    def _build_executor(self) -> Any:
+        """
+        Compile the ReAct agent graph from the current config and prompt file.
+
+        Returns:
+            CompiledStateGraph: The compiled agent graph.
+        """
+        import srsly
+        from langgraph.prebuilt import create_react_agent
+        from tools.context import TokenBudgetTrimmer
+
+        prompts = srsly.read_json(self._prompt_path())
+        if self._trimmer is None:
+            self._trimmer = TokenBudgetTrimmer(
+                max_tokens=self.context_tokens,
+                model=getattr(self.llm, "model_name", None) or "gpt-4o-mini"
+            )
+        return create_react_agent(
             model=self.llm,
-            tools=tools,
+            tools=self._build_tools(),
             checkpointer=self.checkpoint,
-            pre_model_hook=pre_model_hook,
+            pre_model_hook=self._trimmer.hook,
             prompt=prompts["agent_task"]["system_message"],
             # response_format=OutputAgentTaskManagement
         )
 
-        config = {"configurable": {"thread_id": "task_tim_john"}}
-        config_stream = RunnableConfig(callbacks=callbacks, **config) if callbacks else config
-        async for step in agent_executor.astream(
-            {"messages": [{"role":"user","content":command}]},
-            config=config_stream,
-            stream_mode="values"
+    @metrics.timed("agent.setup")
+    def get_executor(self) -> Any:
+        """
+        Return the cached agent graph, rebuilding it if `config.conf` or the
+        prompt file changed since it was compiled.
+
+        Returns:
+            CompiledStateGraph: The compiled agent graph.
+        """
+        config_mtime = self._mtime(self.config_path)
+        if self._signature is not None and config_mtime != self._signature[0]:
+            logger.info("Config changed, reloading config.conf")
+            reload_config()
+            if "context_tokens" not in self.model_fields_set:
+                # the graph is rebuilt below with a trimmer for the new budget
+                self.context_tokens = get_config().getint("agent", "context_tokens", fallback=3000)
+                self._trimmer = None
+
+        signature = (config_mtime, self._mtime(self._prompt_path()))
+        if self._executor is None or signature != self._signature:
+            logger.info("Compiling agent task management graph")
+            self._executor = self._build_executor()
+            self._signature = signature
+        return self._executor
+
+    def _thread_lock(self, thread_id: str) -> asyncio.Lock:
+        """
+        Return the lock serializing runs on one conversation thread.
+
+        Locks are held weakly, so idle threads do not accumulate entries.
+        """
+        lock = self._thread_locks.get(thread_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._thread_locks[thread_id] = lock
+        return lock
+
+    @metrics.timed("agent.run")
+    async def _run(
+            self,
+            command: str,
+            thread_id: str,
+            callbacks: list = [],
+            on_token: Optional[Callable[[str, Optional[str]], Awaitable[None]]] = None
         ):
-            final_answer = step.get("messages")[-1].content if step.get("messages") else None
+        """
+        Execute the agent using a natural language command as input.
+
+        Runs on different threads proceed concurrently; runs on the same
+        thread are serialized so each user's messages stay ordered.
+
+        Args:
+            command (str): The natural language input/query to process.
+            thread_id (str): Conversation thread ID, one per Telegram chat/user.
+            on_token (Callable, optional): Awaited with each text chunk the model
+                streams and the ID of the message it belongs to.
+
+        Returns:
+            dict: The final result from the agent after processing the command.
+        """
+        from langchain_core.messages import AIMessageChunk
+        from langchain_core.runnables import RunnableConfig
+
+        agent_executor = self.get_executor()
+
+        if metrics.enabled:
+            from tools.callbacks import StageTimingCallback
+            callbacks = [*callbacks, StageTimingCallback(metrics)]
+        config = {"configurable": {"thread_id": thread_id}}
+        config_stream = RunnableConfig(callbacks=callbacks, **config) if callbacks else config
+        final_answer = None
+        async with self._thread_lock(thread_id):
+            async for mode, step in agent_executor.astream(
+                {"messages": [{"role":"user","content":command}]},
+                config=config_stream,
+                stream_mode=["values", "messages"] if on_token else ["values"]
+            ):
+                if mode == "messages":
+                    chunk, metadata = step
+                    if metadata.get("langgraph_node") == "agent" and isinstance(chunk, AIMessageChunk):
+                        text = chunk.text()
+                        if text:
+                            await on_token(text, chunk.id)
+                    continue
+                final_answer = step.get("messages")[-1].content if step.get("messages") else None
         return final_answer
\ No newline at end of file
@@ -0,0 +1,143 @@
+import re
+import asyncio
+from typing import *
+from loguru import logger
+
+class AppendQueue:
+    """
+    Write-behind queue that coalesces row appends from many concurrent
+    callers into one Sheets `values().append` per flush window.
+
+    A batch is flushed `max_delay` seconds after its first row arrives, or
+    as soon as `max_batch_size` rows are queued. Batches are flushed one at
+    a time, so rows queued during a flush go out together in the next one.
+    Every caller awaits its own result: an append response whose
+    `updates.updatedRange` covers only that caller's rows, or the exception
+    raised by the append.
+
+    Args:
+        append (Callable): Coroutine function that appends a list of rows and
+            returns the Sheets append response.
+        max_delay (float): Max seconds a row waits before being flushed.
+        max_batch_size (int): Rows that trigger an immediate flush.
+    """
+
+    def __init__(
+            self,
+            append: Callable[[List[list]], Awaitable[dict]],
+            max_delay: float = 0.2,
+            max_batch_size: int = 500
+        ):
+        self.append = append
+        self.max_delay = max_delay
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._pending: List[Tuple[List[list], asyncio.Future]] = []
+        self._pending_rows = 0
+        self._has_items = asyncio.Event()
+        self._full = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self._closed = False
+        self.counters: Dict[str, int] = {"batches": 0, "rows": 0, "requests": 0, "failed_batches": 0}
+
+    async def submit(self, rows: List[list]) -> dict:
+        """
+        Queue rows for the next flush and wait for the outcome.
+
+        Args:
+            rows (List[list]): Rows to append.
+
+        Returns:
+            dict: Append response scoped to these rows.
+
+        Raises:
+            RuntimeError: If the queue has been closed.
+            Exception: Whatever the batched append raised.
+        """
+        if self._closed:
+            raise RuntimeError("Append queue is closed")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((rows, future))
+        self._pending_rows += len(rows)
+        self.counters["requests"] += 1
+        self._has_items.set()
+        if self._pending_rows >= self.max_batch_size:
+            self._full.set()
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return await future
+
+    async def close(self) -> None:
+        """
+        Stop accepting rows and flush everything still queued.
+        """
+        self._closed = True
+        self._has_items.set()
+        self._full.set()
+        if self._worker is not None:
+            await self._worker
+        elif self._pending:
+            while self._pending:
+                await self._flush(self._take())
+
+    async def _run(self) -> None:
+        while self._pending or not self._closed:
+            await self._has_items.wait()
+            if not self._pending:
+                if self._closed:
+                    break
+                self._has_items.clear()
+                continue
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.max_delay)
+            except asyncio.TimeoutError:
+                pass
+
+            batch = self._take()
+            if not self._closed:
+                if not self._pending:
+                    self._has_items.clear()
+                if self._pending_rows < self.max_batch_size:
+                    self._full.clear()
+            await self._flush(batch)
+
+    def _take(self) -> List[Tuple[List[list], asyncio.Future]]:
+        batch, rows = [], 0
+        while self._pending and (not batch or rows + len(self._pending[0][0]) <= self.max_batch_size):
+            item = self._pending.pop(0)
+            batch.append(item)
+            rows += len(item[0])
+        self._pending_rows -= rows
+        return batch
+
+    async def _flush(self, batch: List[Tuple[List[list], asyncio.Future]]) -> None:
+        values = [row for rows, _ in batch for row in rows]
+        try:
+            result = await self.append(values)
+        except Exception as e:
+            logger.error(f"Batched append of {len(values)} row(s) failed: {str(e)}")
+            self.counters["failed_batches"] += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.counters["batches"] += 1
+        self.counters["rows"] += len(values)
+        logger.info(f"Flushed {len(values)} row(s) from {len(batch)} caller(s) in one append")
+
+        match = re.match(r"^(.*)!([A-Z]+)(\d+):([A-Z]+)\d+$", result.get("updates", {}).get("updatedRange") or "")
+        offset = 0
+        for rows, future in batch:
+            updated_range = None
+            if match is not None:
+                sheet, first_column, start, last_column = match.group(1), match.group(2), int(match.group(3)), match.group(4)
+                updated_range = f"{sheet}!{first_column}{start + offset}:{last_column}{start + offset + len(rows) - 1}"
+            offset += len(rows)
+            if not future.done():
+                future.set_result({
+                    **result,
+                    "updates": {**result.get("updates", {}), "updatedRange": updated_range, "updatedRows": len(rows)}
+                })
\ No newline at end of file
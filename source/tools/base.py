@@ -1,40 +1,176 @@
+import json
+import asyncio
 import aiohttp
 from typing import *
 from loguru import logger
 from pydantic import BaseModel
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from tools.metrics import metrics
 
 class BaseTaskManagement(BaseModel):
     """
+    Base model for task management tools.
+
+    `_requests` sends every HTTP call through one connection-pooled
+    `aiohttp.ClientSession` per event loop, shared by the whole process, so
+    keep-alive connections and resolved DNS entries are reused across calls.
+    Open it with `open_session` on startup to apply connector limits and a
+    retry policy, and close it with `close_session` on shutdown; otherwise
+    it is created with the defaults on first use. Sessions left behind by
+    event loops that have since closed are dropped when the next one is
+    created.
     """
 
+    RETRY_STATUS: ClassVar[Set[int]] = {429, 502, 503, 504}
+
+    sessions: ClassVar[Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+    session_options: ClassVar[Dict[str, Any]] = {'limit': 100, 'limit_per_host': 20, 'ttl_dns_cache': 300}
+    retries: ClassVar[int] = 0
+    max_backoff: ClassVar[float] = 8.0
+
+    @classmethod
+    async def open_session(
+            cls,
+            limit: int = 100,
+            limit_per_host: int = 20,
+            ttl_dns_cache: Optional[int] = 300,
+            retries: int = 0,
+            max_backoff: float = 8.0
+        ) -> aiohttp.ClientSession:
+        """
+        Open the shared HTTP session. Call from the bot's `post_init`.
+
+        Args:
+            limit (int): Max open connections in total (0 for no limit).
+            limit_per_host (int): Max open connections per host (0 for no limit).
+            ttl_dns_cache (int, optional): Seconds to cache DNS lookups, None to cache forever.
+            retries (int): Extra attempts for connection failures and
+                429/502/503/504 responses. POST requests are retried only
+                when the connection could not be established.
+            max_backoff (float): Upper bound in seconds for a single backoff wait.
+        """
+        await cls.close_session()
+        BaseTaskManagement.session_options = {'limit': limit, 'limit_per_host': limit_per_host, 'ttl_dns_cache': ttl_dns_cache}
+        BaseTaskManagement.retries = retries
+        BaseTaskManagement.max_backoff = max_backoff
+        return cls._session()
+
+    @classmethod
+    async def close_session(cls) -> None:
+        """
+        Close the running loop's shared HTTP session. Call on application
+        shutdown.
+        """
+        session = BaseTaskManagement.sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    @classmethod
+    def _session(cls) -> aiohttp.ClientSession:
+        sessions, loop = BaseTaskManagement.sessions, asyncio.get_running_loop()
+        session = sessions.get(loop)
+        if session is None or session.closed:
+            for other in [other for other in sessions if other.is_closed()]:
+                # nothing can be awaited on a closed loop; its sockets are
+                # released when the session is collected
+                logger.debug('Dropping HTTP session of a closed event loop')
+                del sessions[other]
+            connector = aiohttp.TCPConnector(**BaseTaskManagement.session_options)
+            session = sessions[loop] = aiohttp.ClientSession(connector=connector)
+        return session
+
+    @classmethod
+    def _retryable(cls, method: str) -> Callable[[BaseException], bool]:
+        def check(e: BaseException) -> bool:
+            if isinstance(e, aiohttp.ClientConnectorError):
+                return True
+            if isinstance(e, _RetryableStatus) and e.status == 429:
+                # rate-limited requests were not applied, so any method may retry
+                return True
+            if method == 'post':
+                # the request may have been applied
+                return False
+            if isinstance(e, _RetryableStatus):
+                return True
+            return isinstance(e, (aiohttp.ServerDisconnectedError, asyncio.TimeoutError))
+        return check
+
+    @staticmethod
+    def _before_sleep(service_name: str) -> Callable[[RetryCallState], None]:
+        def log(state: RetryCallState) -> None:
+            logger.warning(
+                f'Retrying {service_name.upper()} after {state.outcome.exception()!r}, '
+                f'attempt {state.attempt_number + 1} in {state.next_action.sleep:.1f}s'
+            )
+        return log
+
     async def _requests(self, uri: str, params: dict, service_name: str, method: Literal['post', 'get', 'put'] = 'post', timeout: int = 10, **kwargs) -> dict:
         logger.info(f'AIOHTTP requests to {service_name.upper()}')
         timeout = aiohttp.ClientTimeout(total=timeout)
 
-        try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-
-                if method == 'post':
-                    payload = {'url': uri, 'json': params, **kwargs}
-                    func = session.post
-                elif method == 'put':
-                    payload = {'url': uri, 'json': params, **kwargs}
-                    func = session.put
-                else:
-                    payload = {'url': uri, 'params': params, **kwargs}
-                    func = session.get
-
-                async with func(**payload) as response:
-                    if response.status < 300:
-                        logger.info(f'AIOHTTP success requests to {service_name.upper()}')
-                        result = await response.json()
-                        return result
-                    else:
-                        detail = await response.json()
-                        raise ConnectionError(f'Error {service_name.upper()} status code {response.status}. Detail: {detail.get("detail", detail)}')
-        except aiohttp.ClientError as e:
-            logger.error(f'ClientError when calling {service_name.upper()}: {str(e)}')
-            raise
-        except Exception as e:
-            logger.error(f'Unexpected error in _requests to {service_name.upper()}: {str(e)}')
-            raise
\ No newline at end of file
+        with metrics.span(f'http.{service_name.lower()}'):
+            try:
+                async for attempt in AsyncRetrying(
+                    retry=retry_if_exception(self._retryable(method)),
+                    wait=wait_random_exponential(multiplier=0.5, max=self.max_backoff),
+                    stop=stop_after_attempt(self.retries + 1),
+                    before_sleep=self._before_sleep(service_name),
+                    reraise=True
+                ):
+                    with attempt:
+                        return await self._send(uri, params, service_name, method, timeout, **kwargs)
+            except aiohttp.ClientError as e:
+                logger.error(f'ClientError when calling {service_name.upper()}: {str(e)}')
+                raise
+            except Exception as e:
+                logger.error(f'Unexpected error in _requests to {service_name.upper()}: {str(e)}')
+                raise
+
+    async def _send(self, uri: str, params: dict, service_name: str, method: str, timeout: aiohttp.ClientTimeout, **kwargs) -> dict:
+        session = self._session()
+
+        if method == 'post':
+            payload = {'url': uri, 'json': params, **kwargs}
+            func = session.post
+        elif method == 'put':
+            payload = {'url': uri, 'json': params, **kwargs}
+            func = session.put
+        else:
+            payload = {'url': uri, 'params': params, **kwargs}
+            func = session.get
+
+        async with func(timeout=timeout, **payload) as response:
+            if response.status < 300:
+                logger.info(f'AIOHTTP success requests to {service_name.upper()}')
+                result = await response.json()
+                return result
+            else:
+                # decide on retrying from the status alone; error bodies may
+                # be HTML from a proxy rather than JSON
+                retryable = response.status in self.RETRY_STATUS
+                body = (await response.read()).decode('utf-8', errors='replace')
+                try:
+                    detail = json.loads(body)
+                except ValueError:
+                    detail = body[:500]
+                if isinstance(detail, dict):
+                    detail = detail.get('detail', detail)
+                message = f'Error {service_name.upper()} status code {response.status}. Detail: {detail}'
+                raise _RetryableStatus(message, response.status) if retryable else ConnectionError(message)
+
+
+class _RetryableStatus(ConnectionError):
+    """
+    Error status that may succeed on retry; surfaced as `ConnectionError`.
+    """
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
\ No newline at end of file
@@ -0,0 +1,313 @@
+import os
+import re
+import csv
+import json
+import time
+import asyncio
+from typing import *
+from loguru import logger
+from collections import deque
+from pydantic import ValidationError
+
+from tools.utils import ATMFormat
+
+FIELDS: Tuple[str, ...] = ("name", "project_name", "task", "sub_task", "assignor")
+COLUMNS: Tuple[str, ...] = (
+    "timestamp", "assignee", "owner", "project_name", "task", "sub_task", "notes",
+    "start_date", "end_date", "duration_minutes", "assignor", "role", "status", "reference",
+)
+MAX_LOGGED_REJECTS = 20
+KEY_COLUMNS: Tuple[int, ...] = (1, 3, 5)
+
+def file_format(path: str) -> Literal["csv", "jsonl"]:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Unsupported file type {extension or path!r}, use .csv or .jsonl")
+
+def read_records(path: str) -> Iterator[Tuple[int, dict]]:
+    """
+    Stream `(record_number, record)` from a CSV file with a header row or a
+    JSONL file, one record at a time. Record numbers start at 1 and count
+    data records only.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format(path) == "csv":
+            for number, record in enumerate(csv.DictReader(f), start=1):
+                yield number, record
+            return
+        number = 0
+        for line in f:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                record = {"_error": f"invalid JSON: {e}"}
+            yield number, record if isinstance(record, dict) else {"_error": "not a JSON object"}
+
+def validate(record: dict) -> ATMFormat:
+    """
+    Validate one record as a single-task `ATMFormat`.
+
+    Raises:
+        ValueError: If the record is malformed or misses a required field.
+    """
+    if "_error" in record:
+        raise ValueError(record["_error"])
+    values = {field: record.get(field) for field in FIELDS}
+    values["task"] = values["task"] or ""
+    values["assignor"] = values["assignor"] or None
+    entry = ATMFormat(**{field: [value] for field, value in values.items()})
+    for field in ("name", "project_name", "sub_task"):
+        if not getattr(entry, field)[0].strip():
+            raise ValueError(f"{field} is empty")
+    return entry
+
+def row_key(row: Sequence[Any]) -> List[str]:
+    """
+    Assignee, project name and sub-task of a sheet row.
+    """
+    return [str(row[i]).strip() if i < len(row) else "" for i in KEY_COLUMNS]
+
+
+class ImportProgress:
+    """
+    Resume point of an import, saved before and after every appended chunk.
+
+    The file records which input it belongs to (path, size and mtime) and
+    how many input records are already in the sheet, so a rerun skips them.
+    The chunk being appended is recorded in `in_flight` with the keys of its
+    first and last rows; if a run stops before the append returns, the next
+    one looks for those rows after `next_row` to tell whether the chunk
+    reached the sheet.
+    """
+
+    def __init__(self, path: str, source: str):
+        self.path = path
+        self.source = {"path": os.path.abspath(source), "size": os.path.getsize(source), "mtime": os.path.getmtime(source)}
+        self.records = 0
+        self.rows = 0
+        self.rejected = 0
+        self.completed = False
+        self.next_row: Optional[int] = None
+        self.in_flight: Optional[dict] = None
+
+    @classmethod
+    def load(cls, path: str, source: str) -> "ImportProgress":
+        progress = cls(path, source)
+        if not os.path.exists(path):
+            return progress
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("source") != progress.source:
+            logger.warning(f"{path} belongs to a different or changed input, starting over")
+            return progress
+        progress.records = saved["records"]
+        progress.rows = saved["rows"]
+        progress.rejected = saved["rejected"]
+        progress.completed = saved["completed"]
+        progress.next_row = saved.get("next_row")
+        progress.in_flight = saved.get("in_flight")
+        return progress
+
+    def save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "source": self.source,
+                "records": self.records,
+                "rows": self.rows,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "next_row": self.next_row,
+                "in_flight": self.in_flight,
+            }, f)
+        os.replace(tmp, self.path)
+
+
+async def chunk_appended(spreadsheet: Any, progress: ImportProgress) -> bool:
+    """
+    Whether the chunk in flight when the last run stopped is in the sheet:
+    its first and last rows sit `rows - 1` rows apart at or after
+    `next_row`, since an append inserts its rows contiguously.
+    """
+    chunk = progress.in_flight
+    # only the last `rows` keys are kept while scanning
+    window: deque = deque(maxlen=chunk["rows"])
+    async for page in spreadsheet.read_pages(start=progress.next_row or 2):
+        for row in page:
+            window.append(row_key(row))
+            if len(window) == chunk["rows"] and window[-1] == chunk["last"] and window[0] == chunk["first"]:
+                return True
+    return False
+
+
+async def import_tasks(
+        spreadsheet: Any,
+        path: str,
+        chunk_size: int = 1000,
+        progress_path: Optional[str] = None,
+        restart: bool = False
+    ) -> Dict[str, float]:
+    """
+    Stream tasks from a CSV or JSONL file into the task sheet.
+
+    Every record is validated against `ATMFormat` (fields `name`,
+    `project_name`, `task`, `sub_task`, `assignor`); invalid records are
+    logged and skipped. Valid ones are appended `chunk_size` rows per
+    request, with the next chunk read while the previous one is being
+    appended, so at most two chunks are held in memory. Progress is saved
+    after each chunk and a rerun resumes after the last appended record; a
+    chunk whose append was interrupted is looked up in the sheet first, so
+    it is neither appended twice nor lost.
+
+    Args:
+        spreadsheet (SpreadsheetTool): Target sheet.
+        path (str): Input `.csv` (with a header row) or `.jsonl` file.
+        chunk_size (int): Rows per append request.
+        progress_path (str, optional): Progress file, `<path>.progress` by default.
+        restart (bool): Ignore saved progress and import from the first record.
+
+    Returns:
+        dict: Records read, rows appended, records rejected, requests issued and seconds.
+    """
+    progress_path = progress_path or f"{path}.progress"
+    progress = ImportProgress(progress_path, path) if restart else ImportProgress.load(progress_path, path)
+    if progress.completed:
+        logger.info(f"{path} was already imported ({progress.rows} rows), use restart to import it again")
+        return {"records": progress.records, "rows": 0, "rejected": progress.rejected, "requests": 0, "seconds": 0.0}
+    if progress.in_flight is not None:
+        chunk = progress.in_flight
+        if await chunk_appended(spreadsheet, progress):
+            logger.info(f"Records up to {chunk['records']} of {path} reached the sheet before the last run stopped")
+            progress.records = chunk["records"]
+            progress.rows += chunk["rows"]
+            progress.rejected += chunk["rejected"]
+        progress.in_flight = None
+        progress.save()
+    if progress.records:
+        logger.info(f"Resuming {path} after record {progress.records}")
+
+    started_at = time.perf_counter()
+    counters = {"records": 0, "rows": 0, "rejected": 0, "requests": 0}
+    entries: List[ATMFormat] = []
+    pending: Optional[Tuple[asyncio.Task, int, int, int]] = None
+
+    async def commit() -> None:
+        # wait for the chunk in flight, then record it as done
+        nonlocal pending
+        if pending is None:
+            return
+        task, last_record, rows, rejected = pending
+        pending = None
+        result = await task
+        progress.records = last_record
+        progress.rows += rows
+        progress.rejected += rejected
+        match = re.search(r":[A-Z]+(\d+)$", result.get("updates", {}).get("updatedRange") or "")
+        if match:
+            progress.next_row = int(match.group(1)) + 1
+        progress.in_flight = None
+        progress.save()
+        counters["rows"] += rows
+        counters["requests"] += 1
+
+    async def flush(last_record: int, rejected: int) -> None:
+        nonlocal pending, entries
+        columns = {field: [value for entry in entries for value in getattr(entry, field)] for field in FIELDS}
+        values = spreadsheet.task_rows(**columns)
+        entries = []
+        await commit()
+        progress.in_flight = {
+            "records": last_record,
+            "rows": len(values),
+            "rejected": rejected,
+            "first": row_key(values[0]),
+            "last": row_key(values[-1]),
+        }
+        progress.save()
+        pending = (asyncio.create_task(spreadsheet.bulk_append(values)), last_record, len(values), rejected)
+
+    rejected = 0
+    last_record = progress.records
+    try:
+        for number, record in read_records(path):
+            if number <= progress.records:
+                continue
+            counters["records"] += 1
+            last_record = number
+            try:
+                entries.append(validate(record))
+            except (ValidationError, ValueError) as e:
+                rejected += 1
+                counters["rejected"] += 1
+                if counters["rejected"] <= MAX_LOGGED_REJECTS:
+                    logger.warning(f"Skipping record {number} of {path}: {str(e).splitlines()[0]}")
+                continue
+            if len(entries) >= chunk_size:
+                await flush(last_record, rejected)
+                rejected = 0
+                # let the append start before reading on
+                await asyncio.sleep(0)
+
+        if entries:
+            await flush(last_record, rejected)
+            rejected = 0
+        await commit()
+    except BaseException:
+        if pending is not None:
+            pending[0].cancel()
+        raise
+
+    progress.records = last_record
+    progress.rejected += rejected
+    progress.completed = True
+    progress.save()
+    if counters["rejected"] > MAX_LOGGED_REJECTS:
+        logger.warning(f"{counters['rejected']} record(s) of {path} were skipped in total")
+    return {**counters, "seconds": time.perf_counter() - started_at}
+
+
+async def export_tasks(spreadsheet: Any, path: str, page_size: int = 5000) -> Dict[str, float]:
+    """
+    Stream the task sheet to a CSV or JSONL file, one page at a time.
+
+    Data rows start at sheet row 2; the sheet's own header row is replaced
+    by `COLUMNS`. The file is written next to `path` and moved into place
+    when complete, so a failed export never leaves a truncated file behind.
+
+    Args:
+        spreadsheet (SpreadsheetTool): Source sheet.
+        path (str): Output `.csv` or `.jsonl` file.
+        page_size (int): Rows per read request.
+
+    Returns:
+        dict: Rows written, requests issued and seconds.
+    """
+    fmt = file_format(path)
+    started_at = time.perf_counter()
+    counters = {"rows": 0, "requests": 0}
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f) if fmt == "csv" else None
+            if writer is not None:
+                writer.writerow(COLUMNS)
+            async for page in spreadsheet.read_pages(page_size=page_size, start=2):
+                counters["requests"] += 1
+                for row in page:
+                    cells = [*row[:len(COLUMNS)], *[""] * (len(COLUMNS) - len(row))]
+                    if writer is not None:
+                        writer.writerow(cells)
+                    else:
+                        f.write(json.dumps(dict(zip(COLUMNS, cells)), ensure_ascii=False) + "\n")
+                counters["rows"] += len(page)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return {**counters, "seconds": time.perf_counter() - started_at}
\ No newline at end of file
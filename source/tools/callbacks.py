@@ -0,0 +1,47 @@
+import time
+from uuid import UUID
+from typing import *
+from langchain_core.callbacks import BaseCallbackHandler
+
+from tools.metrics import StageMetrics
+
+class StageTimingCallback(BaseCallbackHandler):
+    """
+    LangChain callback recording each model call as stage `agent.llm` and
+    each tool call as `agent.tool.<name>`.
+    """
+
+    run_inline = True
+
+    def __init__(self, metrics: StageMetrics):
+        self.metrics = metrics
+        self._started: Dict[UUID, Tuple[str, float]] = {}
+
+    def _start(self, run_id: UUID, stage: str) -> None:
+        self._started[run_id] = (stage, time.perf_counter())
+
+    def _end(self, run_id: UUID, status: str) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            self.metrics.observe(started[0], time.perf_counter() - started[1], status)
+
+    def on_chat_model_start(self, serialized: dict, messages: list, *, run_id: UUID, **kwargs) -> None:
+        self._start(run_id, "agent.llm")
+
+    def on_llm_start(self, serialized: dict, prompts: list, *, run_id: UUID, **kwargs) -> None:
+        self._start(run_id, "agent.llm")
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs) -> None:
+        self._end(run_id, "ok")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        self._end(run_id, "error")
+
+    def on_tool_start(self, serialized: dict, input_str: str, *, run_id: UUID, **kwargs) -> None:
+        self._start(run_id, f"agent.tool.{(serialized or {}).get('name') or kwargs.get('name') or 'unknown'}")
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs) -> None:
+        self._end(run_id, "ok")
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        self._end(run_id, "error")
\ No newline at end of file
@@ -0,0 +1,556 @@
+import time
+import sqlite3
+import asyncio
+import threading
+from typing import *
+from loguru import logger
+from collections import OrderedDict
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+class BoundedInMemorySaver(InMemorySaver):
+    """
+    In-memory checkpointer with bounded retention.
+
+    Only the last `max_checkpoints_per_thread` checkpoints of each thread are
+    kept, together with the channel blobs and pending writes they reference.
+    Whole threads are evicted once they have been idle for `thread_ttl`
+    seconds, or least-recently-used first while the resident size exceeds
+    `max_bytes`.
+
+    Args:
+        max_checkpoints_per_thread (int): Checkpoints retained per thread/namespace.
+        thread_ttl (float): Idle seconds before a thread is evicted. `0` disables TTL.
+        max_bytes (int): Global cap on serialized bytes held. `0` disables the cap.
+    """
+
+    def __init__(
+            self,
+            *,
+            max_checkpoints_per_thread: int = 10,
+            thread_ttl: float = 3600.0,
+            max_bytes: int = 256 * 1024 * 1024,
+            **kwargs
+        ):
+        super().__init__(**kwargs)
+        self.max_checkpoints_per_thread = max(1, max_checkpoints_per_thread)
+        self.thread_ttl = thread_ttl
+        self.max_bytes = max_bytes
+
+        self._lock = threading.RLock()
+        self._last_access: "OrderedDict[str, float]" = OrderedDict()
+        self._thread_bytes: Dict[str, int] = {}
+        self._resident_bytes = 0
+        self._versions: Dict[Tuple[str, str, str], ChannelVersions] = {}
+        self.counters: Dict[str, int] = {
+            "checkpoint_evictions": 0,
+            "thread_evictions_ttl": 0,
+            "thread_evictions_lru": 0,
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return eviction counters and resident size.
+
+        Returns:
+            dict: Counters plus `threads`, `checkpoints` and `resident_bytes`.
+        """
+        with self._lock:
+            checkpoints = sum(
+                len(cps)
+                for namespaces in self.storage.values()
+                for cps in namespaces.values()
+            )
+            return {
+                **self.counters,
+                "threads": len(self._last_access),
+                "checkpoints": checkpoints,
+                "resident_bytes": self._resident_bytes,
+            }
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            if thread_id not in self.storage:
+                return None
+            self._touch(thread_id)
+            return super().get_tuple(config)
+
+    def put(
+            self,
+            config: RunnableConfig,
+            checkpoint: Checkpoint,
+            metadata: CheckpointMetadata,
+            new_versions: ChannelVersions
+        ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        with self._lock:
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            self._versions[(thread_id, checkpoint_ns, checkpoint["id"])] = dict(checkpoint["channel_versions"])
+            self._prune(thread_id, checkpoint_ns)
+            self._measure(thread_id)
+            self._touch(thread_id)
+            self._evict(keep=thread_id)
+            return next_config
+
+    def put_writes(
+            self,
+            config: RunnableConfig,
+            writes: Sequence[Tuple[str, Any]],
+            task_id: str,
+            task_path: str = ""
+        ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            super().put_writes(config, writes, task_id, task_path)
+            self._measure(thread_id)
+            self._touch(thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._drop_thread(thread_id)
+
+    def _touch(self, thread_id: str) -> None:
+        self._last_access[thread_id] = time.monotonic()
+        self._last_access.move_to_end(thread_id)
+
+    def _blob_keys(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> Set[tuple]:
+        versions = self._versions.get((thread_id, checkpoint_ns, checkpoint_id), {})
+        return {(thread_id, checkpoint_ns, channel, version) for channel, version in versions.items()}
+
+    def _prune(self, thread_id: str, checkpoint_ns: str) -> None:
+        """
+        Drop checkpoints beyond the retention limit, oldest first, along with
+        their pending writes and any blobs no retained checkpoint references.
+        """
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        excess = len(checkpoints) - self.max_checkpoints_per_thread
+        if excess <= 0:
+            return
+
+        # checkpoint IDs are monotonic, so insertion order is chronological
+        stale_ids = list(checkpoints)[:excess]
+        stale_blobs = set()
+        for checkpoint_id in stale_ids:
+            del checkpoints[checkpoint_id]
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            stale_blobs |= self._blob_keys(thread_id, checkpoint_ns, checkpoint_id)
+            self._versions.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+        for checkpoint_id in checkpoints:
+            stale_blobs -= self._blob_keys(thread_id, checkpoint_ns, checkpoint_id)
+        for key in stale_blobs:
+            self.blobs.pop(key, None)
+
+        self.counters["checkpoint_evictions"] += excess
+
+    def _measure(self, thread_id: str) -> None:
+        """
+        Recompute the serialized size of one thread and update the global total.
+        """
+        size = 0
+        blob_keys = set()
+        for checkpoint_ns, checkpoints in self.storage.get(thread_id, {}).items():
+            for checkpoint_id, (checkpoint, metadata, _) in checkpoints.items():
+                size += len(checkpoint[1]) + len(metadata[1])
+                for _, _, value, _ in self.writes.get((thread_id, checkpoint_ns, checkpoint_id), {}).values():
+                    size += len(value[1])
+                blob_keys |= self._blob_keys(thread_id, checkpoint_ns, checkpoint_id)
+        for key in blob_keys:
+            blob = self.blobs.get(key)
+            if blob is not None:
+                size += len(blob[1])
+
+        self._resident_bytes += size - self._thread_bytes.get(thread_id, 0)
+        self._thread_bytes[thread_id] = size
+
+    def _drop_thread(self, thread_id: str) -> None:
+        for checkpoint_ns, checkpoints in self.storage.pop(thread_id, {}).items():
+            for checkpoint_id in checkpoints:
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+                for key in self._blob_keys(thread_id, checkpoint_ns, checkpoint_id):
+                    self.blobs.pop(key, None)
+                self._versions.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        self._resident_bytes -= self._thread_bytes.pop(thread_id, 0)
+        self._last_access.pop(thread_id, None)
+
+    def _evict(self, keep: str) -> None:
+        """
+        Evict idle threads past the TTL, then least-recently-used threads
+        while the resident size is above `max_bytes`.
+        """
+        if self.thread_ttl > 0:
+            deadline = time.monotonic() - self.thread_ttl
+            while self._last_access:
+                thread_id, last_access = next(iter(self._last_access.items()))
+                if last_access >= deadline or thread_id == keep:
+                    break
+                self._drop_thread(thread_id)
+                self.counters["thread_evictions_ttl"] += 1
+
+        if self.max_bytes > 0:
+            while self._resident_bytes > self.max_bytes and len(self._last_access) > 1:
+                thread_id = next(iter(self._last_access))
+                if thread_id == keep:
+                    self._last_access.move_to_end(thread_id)
+                    continue
+                logger.debug(f"Evicting checkpoint thread {thread_id} (resident {self._resident_bytes} bytes)")
+                self._drop_thread(thread_id)
+                self.counters["thread_evictions_lru"] += 1
+
+class SQLiteSaver(BaseCheckpointSaver[str]):
+    """
+    SQLite-backed checkpointer so conversations survive restarts and can be
+    shared by several bot processes on the same host.
+
+    The database runs in WAL mode so readers never block the writer. Writes
+    are queued in memory and written in one short transaction after
+    `batch_size` rows, at most `flush_interval` seconds after the first
+    queued one, or before the next read. The database write lock is only
+    held while a batch is written, so other processes sharing the file are
+    not stalled. Checkpoints and writes are stored with the default msgpack
+    serializer.
+
+    Args:
+        path (str): Path of the SQLite database file.
+        batch_size (int): Rows per transaction. `1` commits every write.
+        flush_interval (float): Max seconds a write stays queued.
+        max_checkpoints_per_thread (int): Checkpoints retained per thread/namespace. `0` keeps all.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            *,
+            batch_size: int = 32,
+            flush_interval: float = 0.5,
+            max_checkpoints_per_thread: int = 10,
+            **kwargs
+        ):
+        super().__init__(**kwargs)
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_checkpoints_per_thread = max_checkpoints_per_thread
+
+        self._lock = threading.RLock()
+        self._pending: List[Tuple[str, List[tuple]]] = []
+        self._pending_rows = 0
+        self._touched: Set[Tuple[str, str]] = set()
+        self._timer: Optional[threading.Timer] = None
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                parent_checkpoint_id TEXT,
+                type TEXT,
+                checkpoint BLOB,
+                metadata_type TEXT,
+                metadata BLOB,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+            );
+            CREATE TABLE IF NOT EXISTS writes (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                channel TEXT NOT NULL,
+                type TEXT,
+                value BLOB,
+                task_path TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+            );
+            """
+        )
+        self.conn.commit()
+
+    def flush(self) -> None:
+        """
+        Write and commit queued rows in one transaction, then drop
+        checkpoints beyond the retention limit of the threads written to.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            pending, touched = self._pending, self._touched
+            self._pending, self._pending_rows, self._touched = [], 0, set()
+            with self.conn:
+                for statement, rows in pending:
+                    self.conn.executemany(statement, rows)
+                for thread_id, checkpoint_ns in touched:
+                    self._prune(thread_id, checkpoint_ns)
+
+    def close(self) -> None:
+        """
+        Flush pending writes and close the database connection.
+        """
+        with self._lock:
+            self.flush()
+            self.conn.close()
+
+    def _queue(self, statement: str, rows: List[tuple]) -> None:
+        self._pending.append((statement, rows))
+        self._pending_rows += len(rows)
+        if self._pending_rows >= self.batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _load_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> List[Tuple[str, str, Any]]:
+        rows = self.conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id)
+        ).fetchall()
+        return [(task_id, channel, self.serde.loads_typed((type_, value))) for task_id, channel, type_, value in rows]
+
+    def _to_tuple(self, thread_id: str, checkpoint_ns: str, row: tuple, metadata: Optional[dict] = None) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata_type, metadata_b = row
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((type_, checkpoint)),
+            metadata=metadata if metadata is not None else self.serde.loads_typed((metadata_type, metadata_b)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=self._load_writes(thread_id, checkpoint_ns, checkpoint_id),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = (
+            "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params: tuple = (thread_id, checkpoint_ns)
+        if checkpoint_id := get_checkpoint_id(config):
+            query += " AND checkpoint_id = ?"
+            params += (checkpoint_id,)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+
+        with self._lock:
+            self.flush()
+            row = self.conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            return self._to_tuple(thread_id, checkpoint_ns, row)
+
+    def list(
+            self,
+            config: Optional[RunnableConfig],
+            *,
+            filter: Optional[Dict[str, Any]] = None,
+            before: Optional[RunnableConfig] = None,
+            limit: Optional[int] = None
+        ) -> Iterator[CheckpointTuple]:
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+            "FROM checkpoints"
+        )
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_checkpoint_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_checkpoint_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            self.flush()
+            rows = self.conn.execute(query, params).fetchall()
+            results = []
+            for thread_id, checkpoint_ns, *row in rows:
+                metadata = self.serde.loads_typed((row[4], row[5]))
+                if filter and not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+                results.append(self._to_tuple(thread_id, checkpoint_ns, tuple(row), metadata))
+                if limit is not None and len(results) >= limit:
+                    break
+        yield from results
+
+    def put(
+            self,
+            config: RunnableConfig,
+            checkpoint: Checkpoint,
+            metadata: CheckpointMetadata,
+            new_versions: ChannelVersions
+        ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        type_, checkpoint_b = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_b = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+
+        with self._lock:
+            self._touched.add((thread_id, checkpoint_ns))
+            self._queue(
+                "INSERT OR REPLACE INTO checkpoints "
+                "(thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    type_,
+                    checkpoint_b,
+                    metadata_type,
+                    metadata_b,
+                )]
+            )
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+            self,
+            config: RunnableConfig,
+            writes: Sequence[Tuple[str, Any]],
+            task_id: str,
+            task_path: str = ""
+        ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        verb = "INSERT OR REPLACE" if all(channel in WRITES_IDX_MAP for channel, _ in writes) else "INSERT OR IGNORE"
+
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, value_b = self.serde.dumps_typed(value)
+            rows.append((
+                thread_id,
+                checkpoint_ns,
+                checkpoint_id,
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                type_,
+                value_b,
+                task_path,
+            ))
+
+        with self._lock:
+            self._queue(
+                f"{verb} INTO writes "
+                "(thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self.flush()
+            with self.conn:
+                self.conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+                self.conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+
+    def _prune(self, thread_id: str, checkpoint_ns: str) -> None:
+        """
+        Delete checkpoints (and their writes) beyond the retention limit.
+        """
+        if self.max_checkpoints_per_thread <= 0:
+            return
+        stale = self.conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+            (thread_id, checkpoint_ns, self.max_checkpoints_per_thread)
+        ).fetchall()
+        if not stale:
+            return
+        params = [(thread_id, checkpoint_ns, checkpoint_id) for checkpoint_id, in stale]
+        self.conn.executemany(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?", params
+        )
+        self.conn.executemany(
+            "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?", params
+        )
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+            self,
+            config: Optional[RunnableConfig],
+            *,
+            filter: Optional[Dict[str, Any]] = None,
+            before: Optional[RunnableConfig] = None,
+            limit: Optional[int] = None
+        ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+            self,
+            config: RunnableConfig,
+            checkpoint: Checkpoint,
+            metadata: CheckpointMetadata,
+            new_versions: ChannelVersions
+        ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+            self,
+            config: RunnableConfig,
+            writes: Sequence[Tuple[str, Any]],
+            task_id: str,
+            task_path: str = ""
+        ) -> None:
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await asyncio.to_thread(self.delete_thread, thread_id)
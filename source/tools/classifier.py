@@ -0,0 +1,152 @@
+import os
+import re
+import sys
+import srsly
+import asyncio
+import tempfile
+import threading
+from typing import *
+from loguru import logger
+from collections import OrderedDict
+from pydantic import PrivateAttr
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_project = os.path.dirname(os.path.join(path_this, ".."))
+path_root = os.path.dirname(os.path.join(path_this, "../.."))
+sys.path.extend([path_root, path_project, path_this])
+
+from tools import BaseTaskManagement
+from tools.utils import TaskCategoryFormat
+
+class TaskClassifier(BaseTaskManagement):
+    """
+    Assigns a task category to each sub-task, memoizing the answers.
+
+    Sub-tasks are looked up by normalized text in an in-memory LRU cache of
+    `cache_size` entries, optionally persisted as JSON at `cache_path`. All
+    misses of one message are classified together in a single LLM call.
+
+    New answers are saved at most once per `save_delay` seconds; each save
+    writes a temporary file next to `cache_path` and renames it over the
+    old one, so readers never see a half-written cache. Call `flush` on
+    shutdown to save pending answers.
+    """
+
+    llm: Any
+    cache_size: int = 2048
+    cache_path: Optional[str] = None
+    save_delay: float = 5.0
+
+    SYSTEM_MESSAGE: ClassVar[str] = (
+        "Classify each sub-task into one task category. "
+        "Allowed categories: Research, Project, Maintenance, Delivery, Pitching, "
+        "Development, or any other suitable single category. "
+        "Return exactly one category per sub-task, in the same order."
+    )
+
+    _cache: "OrderedDict[str, str]" = PrivateAttr(default_factory=OrderedDict)
+    _hits: int = PrivateAttr(default=0)
+    _misses: int = PrivateAttr(default=0)
+    _save_task: Optional[asyncio.Task] = PrivateAttr(default=None)
+    _save_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context: Any) -> None:
+        if self.cache_path and os.path.exists(self.cache_path):
+            try:
+                for key, category in list(srsly.read_json(self.cache_path).items())[-self.cache_size:]:
+                    self._cache[key] = category
+                logger.info(f"Loaded {len(self._cache)} cached task categories")
+            except Exception as e:
+                logger.warning(f"Could not load task category cache {self.cache_path}: {str(e)}")
+
+    @staticmethod
+    def normalize(sub_task: str) -> str:
+        return re.sub(r"\s+", " ", sub_task).strip(" \t.,;:!?-").lower()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return cache hits, misses, hit rate and size.
+        """
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "size": len(self._cache),
+        }
+
+    async def classify(self, sub_tasks: List[str]) -> List[str]:
+        """
+        Classify sub-tasks into task categories.
+
+        Args:
+            sub_tasks (List[str]): Sub-task descriptions.
+
+        Returns:
+            List[str]: One category per sub-task.
+
+        Raises:
+            ValueError: If the model does not return one category per sub-task.
+        """
+        keys = [self.normalize(sub_task) for sub_task in sub_tasks]
+        # copied before awaiting: a concurrent call may evict these entries
+        known = {key: self._cache[key] for key in keys if key in self._cache}
+        missing = list(dict.fromkeys(key for key in keys if key not in known))
+        misses = sum(1 for key in keys if key not in known)
+        self._misses += misses
+        self._hits += len(keys) - misses
+
+        if missing:
+            known.update(zip(missing, await self._classify_batch(missing)))
+
+        result = [known[key] for key in keys]
+        for key in dict.fromkeys(keys):
+            self._cache[key] = known[key]
+            self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        if missing and self.cache_path and self._save_task is None:
+            self._save_task = asyncio.create_task(self._save_later())
+        return result
+
+    async def _save_later(self) -> None:
+        await asyncio.sleep(self.save_delay)
+        self._save_task = None
+        await self._save()
+
+    async def _save(self) -> None:
+        try:
+            await asyncio.to_thread(self._write, dict(self._cache))
+        except Exception as e:
+            logger.warning(f"Could not save task category cache {self.cache_path}: {str(e)}")
+
+    def _write(self, categories: Dict[str, str]) -> None:
+        with self._save_lock:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.cache_path) or ".", suffix=".tmp")
+            os.close(fd)
+            try:
+                srsly.write_json(tmp_path, categories)
+                os.replace(tmp_path, self.cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    async def flush(self) -> None:
+        """
+        Save pending answers now instead of after `save_delay`.
+        """
+        if self._save_task is not None:
+            self._save_task.cancel()
+            self._save_task = None
+            await self._save()
+
+    async def _classify_batch(self, sub_tasks: List[str]) -> List[str]:
+        logger.info(f"Classifying {len(sub_tasks)} sub-task(s)")
+        numbered = "\n".join(f"{i}. {sub_task}" for i, sub_task in enumerate(sub_tasks, start=1))
+        result = await self.llm.with_structured_output(TaskCategoryFormat).ainvoke([
+            {"role": "system", "content": self.SYSTEM_MESSAGE},
+            {"role": "user", "content": numbered},
+        ])
+        if len(result.task) != len(sub_tasks):
+            raise ValueError(f"Expected {len(sub_tasks)} categories, got {len(result.task)}")
+        return [category.strip() for category in result.task]
\ No newline at end of file
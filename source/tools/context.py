@@ -0,0 +1,128 @@
+import tiktoken
+from typing import *
+from loguru import logger
+from collections import OrderedDict
+from langchain_core.messages import BaseMessage
+
+class TokenBudgetTrimmer:
+    """
+    Pre-model hook that sends the model the most recent messages fitting a
+    token budget.
+
+    Messages are taken newest first in units: a human or plain AI message on
+    its own, or an AI message with tool calls together with all of its tool
+    results, so the model never sees a tool call without its answer (or the
+    reverse). The newest unit is always kept. Token counts are cached by
+    message ID, so each step only counts messages it has not seen before and
+    stops walking back once the budget is spent.
+
+    Args:
+        max_tokens (int): Token budget for the messages sent to the model.
+        model (str): Model name used to pick the tiktoken encoding.
+        cache_size (int): Max number of cached per-message token counts.
+    """
+
+    MESSAGE_OVERHEAD: ClassVar[int] = 4
+
+    def __init__(self, max_tokens: int = 3000, model: str = "gpt-4o-mini", cache_size: int = 100_000):
+        self.max_tokens = max_tokens
+        self.cache_size = cache_size
+        self._encoding = self._load_encoding(model)
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+
+    @staticmethod
+    def _load_encoding(model: str) -> Optional[tiktoken.Encoding]:
+        try:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                logger.warning(f"No tiktoken encoding for {model}, using o200k_base")
+                return tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            # the BPE file is downloaded on first use; estimate if unavailable
+            logger.warning(f"Could not load tiktoken encoding, estimating tokens from length: {str(e)}")
+            return None
+
+    def _tokens(self, text: str) -> int:
+        if self._encoding is None:
+            return len(text) // 4 + 1
+        return len(self._encoding.encode(text))
+
+    @staticmethod
+    def _text(message: BaseMessage) -> str:
+        if isinstance(message.content, str):
+            return message.content
+        return " ".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in message.content
+        )
+
+    def count(self, message: BaseMessage) -> int:
+        """
+        Return the token count of a message, cached by message ID.
+        """
+        key = message.id
+        if key is not None and key in self._counts:
+            self._counts.move_to_end(key)
+            return self._counts[key]
+
+        tokens = self.MESSAGE_OVERHEAD + self._tokens(self._text(message))
+        for tool_call in getattr(message, "tool_calls", None) or []:
+            tokens += self._tokens(f"{tool_call['name']}{tool_call['args']}")
+
+        if key is not None:
+            self._counts[key] = tokens
+            if len(self._counts) > self.cache_size:
+                self._counts.popitem(last=False)
+        return tokens
+
+    def trim(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        """
+        Return the newest human/AI/tool messages that fit the token budget.
+        """
+        kept: List[List[BaseMessage]] = []
+        used = 0
+        i = len(messages) - 1
+        while i >= 0:
+            message = messages[i]
+            if message.type == "tool":
+                unit = []
+                while i >= 0 and messages[i].type == "tool":
+                    unit.append(messages[i])
+                    i -= 1
+                if i < 0 or messages[i].type != "ai" or not getattr(messages[i], "tool_calls", None):
+                    # orphaned tool results
+                    continue
+                unit.append(messages[i])
+                unit.reverse()
+            elif message.type == "ai" and getattr(message, "tool_calls", None):
+                # tool calls without results yet
+                i -= 1
+                continue
+            elif message.type in ("human", "ai"):
+                unit = [message]
+            else:
+                i -= 1
+                continue
+            i -= 1
+
+            tokens = sum(self.count(m) for m in unit)
+            if kept and used + tokens > self.max_tokens:
+                break
+            kept.append(unit)
+            used += tokens
+
+        return [m for unit in reversed(kept) for m in unit]
+
+    async def hook(self, state: dict, **kwargs) -> dict:
+        """
+        Hook executed before model inference.
+
+        Args:
+            state (dict): The current agent state including full message history.
+            **kwargs: Additional optional keyword arguments.
+
+        Returns:
+            dict: Dictionary with key 'llm_input_messages' containing recent messages.
+        """
+        return {"llm_input_messages": self.trim(state["messages"])}
\ No newline at end of file
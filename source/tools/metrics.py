@@ -0,0 +1,159 @@
+import time
+import bisect
+import asyncio
+import functools
+from typing import *
+from loguru import logger
+
+class StageMetrics:
+    """
+    Latency histograms per processing stage, exposed in the Prometheus text
+    format.
+
+    Stages are timed with the `timed` decorator or the `span` context
+    manager and recorded as `atm_stage_duration_seconds{stage, status}`,
+    where status is "ok" or "error". Gauges from other components (queue
+    depths, cache hit rates) are added with `add_collector` and read when
+    the metrics are rendered.
+
+    While `enabled` is False nothing is recorded and timed calls cost one
+    attribute check.
+
+    Args:
+        enabled (bool): Record observations.
+        buckets (Sequence[float]): Histogram upper bounds in seconds.
+    """
+
+    NAME: ClassVar[str] = "atm_stage_duration_seconds"
+    BUCKETS: ClassVar[Tuple[float, ...]] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, enabled: bool = False, buckets: Sequence[float] = BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self._histograms: Dict[Tuple[str, str], List[float]] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, Dict[str, str], float]]]] = []
+        self._runner: Optional[Any] = None
+
+    def observe(self, stage: str, seconds: float, status: str = "ok") -> None:
+        # bucket counts, then sum and count
+        histogram = self._histograms.get((stage, status))
+        if histogram is None:
+            histogram = self._histograms[(stage, status)] = [0.0] * (len(self.buckets) + 2)
+        histogram[bisect.bisect_left(self.buckets, seconds)] += 1
+        histogram[-2] += seconds
+        histogram[-1] += 1
+
+    def span(self, stage: str) -> "_Span":
+        """
+        Context manager timing the enclosed block as `stage`.
+        """
+        return _Span(self, stage)
+
+    def timed(self, stage: str) -> Callable:
+        """
+        Decorator timing every call of a function or coroutine function as `stage`.
+        """
+        def decorate(func: Callable) -> Callable:
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+                    with _Span(self, stage):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def add_collector(self, collect: Callable[[], Iterable[Tuple[str, Dict[str, str], float]]]) -> None:
+        """
+        Register a callable returning `(name, labels, value)` gauge samples.
+        """
+        self._collectors.append(collect)
+
+    @staticmethod
+    def _labels(labels: Dict[str, str]) -> str:
+        if not labels:
+            return ""
+        escaped = (
+            f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+            for key, value in labels.items()
+        )
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self) -> str:
+        """
+        Return all metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {self.NAME} Time spent per processing stage.",
+            f"# TYPE {self.NAME} histogram",
+        ]
+        for (stage, status), histogram in sorted(self._histograms.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), histogram):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.NAME}_bucket{self._labels({'stage': stage, 'status': status, 'le': le})} {cumulative:g}")
+            labels = self._labels({"stage": stage, "status": status})
+            lines.append(f"{self.NAME}_sum{labels} {histogram[-2]!r}")
+            lines.append(f"{self.NAME}_count{labels} {histogram[-1]:g}")
+
+        gauges: Dict[str, List[str]] = {}
+        for collect in self._collectors:
+            try:
+                for name, labels, value in collect():
+                    gauges.setdefault(name, []).append(f"{name}{self._labels(labels)} {float(value)!r}")
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {str(e)}")
+        for name, samples in gauges.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    async def start_server(self, host: str = "127.0.0.1", port: int = 9100) -> None:
+        """
+        Serve `GET /metrics` on a local HTTP port.
+        """
+        from aiohttp import web
+
+        async def handle(request: web.Request) -> web.Response:
+            return web.Response(text=self.render(), content_type="text/plain", charset="utf-8")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        logger.info(f"Metrics available at http://{host}:{port}/metrics")
+
+    async def stop_server(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+class _Span:
+    __slots__ = ("metrics", "stage", "started_at")
+
+    def __init__(self, metrics: StageMetrics, stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self) -> "_Span":
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.metrics.enabled:
+            self.metrics.observe(self.stage, time.perf_counter() - self.started_at, "ok" if exc_type is None else "error")
+
+
+metrics = StageMetrics()
\ No newline at end of file
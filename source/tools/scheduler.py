@@ -0,0 +1,185 @@
+import time
+import heapq
+import asyncio
+import itertools
+from typing import *
+from loguru import logger
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+T = TypeVar("T")
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate_per_minute`, holding at most `burst` tokens.
+
+    `reserve` always takes a token and returns how long the caller must wait
+    for it, so waiters are served in arrival order without polling.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def reserve(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class PrioritySlots:
+    """
+    Semaphore whose waiters are woken lowest priority value first.
+    """
+
+    def __init__(self, slots: int):
+        self.free = max(1, slots)
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    async def acquire(self, priority: int) -> None:
+        if self.free > 0 and not self._waiters:
+            self.free -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.free += 1
+
+
+class SheetsScheduler:
+    """
+    Central gate for every Google Sheets request.
+
+    Reads and writes draw from separate token buckets sized to the Sheets
+    per-minute quotas, then compete for `max_concurrency` in-flight slots
+    where waiting reads are always served before writes. Throttled (429) and
+    transient server errors are retried with jittered exponential backoff.
+    Writes are retried on 429 only, because a 5xx may hide an append that
+    was in fact applied.
+
+    Args:
+        read_per_minute (float): Read request quota per minute.
+        write_per_minute (float): Write request quota per minute.
+        read_burst (float): Reads allowed back-to-back before throttling.
+        write_burst (float): Writes allowed back-to-back before throttling.
+        max_concurrency (int): Requests in flight at once.
+        max_attempts (int): Attempts per request, including the first.
+        max_backoff (float): Upper bound in seconds for a single backoff wait.
+    """
+
+    PRIORITY: ClassVar[Dict[str, int]] = {"read": 0, "write": 1}
+    RETRY_READ_STATUS: ClassVar[Set[int]] = {429, 500, 502, 503, 504}
+    RETRY_WRITE_STATUS: ClassVar[Set[int]] = {429}
+
+    def __init__(
+            self,
+            read_per_minute: float = 60,
+            write_per_minute: float = 60,
+            read_burst: float = 10,
+            write_burst: float = 10,
+            max_concurrency: int = 8,
+            max_attempts: int = 5,
+            max_backoff: float = 32.0
+        ):
+        self.buckets = {
+            "read": TokenBucket(read_per_minute, read_burst),
+            "write": TokenBucket(write_per_minute, write_burst),
+        }
+        self.slots = PrioritySlots(max_concurrency)
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        self.metrics: Dict[str, Dict[str, float]] = {
+            kind: {"queue_depth": 0, "requests": 0, "retries": 0, "failures": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+            for kind in self.PRIORITY
+        }
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return queue depth, wait time and retry counters per request kind.
+        """
+        return {
+            kind: {**metrics, "mean_wait_seconds": metrics["wait_seconds"] / metrics["requests"] if metrics["requests"] else 0.0}
+            for kind, metrics in self.metrics.items()
+        }
+
+    def _retryable(self, kind: str) -> Callable[[BaseException], bool]:
+        statuses = self.RETRY_READ_STATUS if kind == "read" else self.RETRY_WRITE_STATUS
+
+        def check(e: BaseException) -> bool:
+            from googleapiclient.errors import HttpError
+            if isinstance(e, HttpError):
+                return e.resp.status in statuses
+            return kind == "read" and isinstance(e, (TimeoutError, ConnectionError))
+        return check
+
+    def _before_sleep(self, kind: str) -> Callable[[RetryCallState], None]:
+        def log(state: RetryCallState) -> None:
+            self.metrics[kind]["retries"] += 1
+            logger.warning(
+                f"Sheets {kind} failed ({state.outcome.exception()}), "
+                f"retry {state.attempt_number}/{self.max_attempts - 1} in {state.next_action.sleep:.1f}s"
+            )
+        return log
+
+    async def run(self, kind: Literal["read", "write"], call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run one Sheets request under the quota, priority and retry policy.
+
+        Args:
+            kind (str): "read" or "write".
+            call (Callable): Zero-argument coroutine function issuing the request.
+
+        Returns:
+            The result of `call`.
+        """
+        metrics = self.metrics[kind]
+        metrics["queue_depth"] += 1
+        try:
+            async for attempt in AsyncRetrying(
+                retry=retry_if_exception(self._retryable(kind)),
+                wait=wait_random_exponential(multiplier=1, max=self.max_backoff),
+                stop=stop_after_attempt(self.max_attempts),
+                before_sleep=self._before_sleep(kind),
+                reraise=True
+            ):
+                with attempt:
+                    queued_at = time.monotonic()
+                    delay = self.buckets[kind].reserve()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    await self.slots.acquire(self.PRIORITY[kind])
+                    try:
+                        waited = time.monotonic() - queued_at
+                        metrics["requests"] += 1
+                        metrics["wait_seconds"] += waited
+                        metrics["max_wait_seconds"] = max(metrics["max_wait_seconds"], waited)
+                        return await call()
+                    finally:
+                        self.slots.release()
+        except Exception:
+            metrics["failures"] += 1
+            raise
+        finally:
+            metrics["queue_depth"] -= 1
\ No newline at end of file
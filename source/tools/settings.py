@@ -0,0 +1,39 @@
+import os
+from typing import *
+from configparser import ConfigParser
+
+path_this = os.path.dirname(os.path.abspath(__file__))
+path_root = os.path.dirname(os.path.join(path_this, "../.."))
+
+CONFIG_PATH = os.path.join(path_root, "config.conf")
+
+_config: Optional[ConfigParser] = None
+
+def get_config() -> ConfigParser:
+    """
+    Return the process-wide configuration, reading `config.conf` on first
+    use. Every tool shares this one parser, so the file is read once and a
+    missing file only fails when a required option is looked up.
+    """
+    global _config
+    if _config is None:
+        _config = ConfigParser()
+        _config.read(CONFIG_PATH)
+    return _config
+
+def set_config(config: ConfigParser) -> None:
+    """
+    Inject the configuration used by every tool, e.g. from tests or
+    benchmarks. Call before the tools are first used.
+    """
+    global _config
+    _config = config
+
+def reload_config() -> ConfigParser:
+    """
+    Re-read `config.conf` into the shared parser in place, so holders of
+    it see the new values.
+    """
+    config = get_config()
+    config.read(CONFIG_PATH)
+    return config
\ No newline at end of file
@@ -1,11 +1,12 @@
 import os
+import re
 import sys
+import asyncio
+import threading
 from typing import *
 from loguru import logger
-from configparser import ConfigParser
 from datetime import datetime, timedelta
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from concurrent.futures import ThreadPoolExecutor
 
 path_this = os.path.dirname(os.path.abspath(__file__))
 path_project = os.path.dirname(os.path.join(path_this, ".."))
@@ -13,6 +14,12 @@ path_root = os.path.dirname(os.path.join(path_this, "../.."))
 sys.path.extend([path_root, path_project, path_this])
 
 from tools import BaseTaskManagement
+from tools.task_cache import TaskCache
+from tools.task_table import TaskTable
+from tools.append_queue import AppendQueue
+from tools.scheduler import SheetsScheduler
+from tools.metrics import metrics
+from tools.settings import get_config
 
 class SpreadsheetTool(BaseTaskManagement):
     """
@@ -24,40 +31,300 @@ class SpreadsheetTool(BaseTaskManagement):
     start date, assignor, and status.
 
     The class uses Google Sheets API with service account authentication.
+    The Google API client is blocking, so every Sheets call runs on a shared,
+    bounded thread pool (`[spreadsheet] max_workers` in `config.conf`) to
+    keep the event loop free. Credentials and the discovery client are built
+    once per process; each pool thread keeps its own keep-alive HTTP
+    connection because httplib2 is not thread-safe.
+
+    Reads are served from a shared `TaskCache` of the task sheet that syncs
+    incrementally, so lookups after warm-up need no API calls. Appends from
+    concurrent callers are coalesced by a shared `AppendQueue`. Every request
+    passes through a `SheetsScheduler` that enforces the read/write quotas,
+    favours reads and retries throttled calls.
+
+    The thread pool, scheduler and cache are created from the shared config
+    on first instantiation (see `setup`), and the Google client libraries
+    are imported when the first request is made, so importing this module
+    needs neither `config.conf` nor the Google API client.
     """
 
-    config: ClassVar[ConfigParser] = ConfigParser()
-    config.read(os.path.join(path_root, "config.conf"))
-
     SPREADSHEET_ID: ClassVar[str] = "1ERtqh9-4-gX1qQoIh9rcecnt2JvJN5GLJZQcteBEAYg"
-    SERVICE_ACCOUNT_FILE: ClassVar[str] = config["default"]["spreadsheet_path"]
+    SERVICE_ACCOUNT_FILE: ClassVar[Optional[str]] = None
     SCOPES: ClassVar[List[str]] = ["https://www.googleapis.com/auth/spreadsheets"]
+    SHEET: ClassVar[str] = "Recap Task Agent"
 
-    async def input_task_management(
-            self, 
-            name: List[str],
-            project_name: List[str], 
-            task: List[str],
-            sub_task: List[str],
-            assignor: List[str]
-        ):
+    executor: ClassVar[Optional[ThreadPoolExecutor]] = None
+    scheduler: ClassVar[Optional[SheetsScheduler]] = None
+
+    client_lock: ClassVar[threading.Lock] = threading.Lock()
+    client_local: ClassVar[threading.local] = threading.local()
+    credentials: ClassVar[Optional[Any]] = None
+    service: ClassVar[Optional[Any]] = None
+    values_resource: ClassVar[Optional[Any]] = None
+
+    task_cache: ClassVar[Optional[TaskCache]] = None
+    append_queue: ClassVar[Optional[AppendQueue]] = None
+
+    def model_post_init(self, __context: Any) -> None:
+        self.setup()
+
+    @classmethod
+    def setup(cls) -> None:
         """
-        Append multiple task entries to the Google Spreadsheet.
+        Create the thread pool, request scheduler and task cache from
+        `[spreadsheet]` in the config, unless already set (e.g. by a
+        benchmark). Called on instantiation.
+        """
+        if cls.executor is not None and cls.scheduler is not None and cls.task_cache is not None:
+            return
+        config = get_config()
+        with cls.client_lock:
+            if cls.executor is None:
+                cls.executor = ThreadPoolExecutor(
+                    max_workers=config.getint("spreadsheet", "max_workers", fallback=8),
+                    thread_name_prefix="sheets"
+                )
+            if cls.scheduler is None:
+                cls.scheduler = SheetsScheduler(
+                    read_per_minute=config.getfloat("spreadsheet", "read_per_minute", fallback=60),
+                    write_per_minute=config.getfloat("spreadsheet", "write_per_minute", fallback=60),
+                    read_burst=config.getfloat("spreadsheet", "read_burst", fallback=10),
+                    write_burst=config.getfloat("spreadsheet", "write_burst", fallback=10),
+                    max_concurrency=config.getint("spreadsheet", "max_workers", fallback=8),
+                    max_attempts=config.getint("spreadsheet", "max_attempts", fallback=5),
+                    max_backoff=config.getfloat("spreadsheet", "max_backoff", fallback=32.0)
+                )
+            if cls.task_cache is None:
+                cls.task_cache = TaskCache(
+                    sync_interval=config.getfloat("spreadsheet", "sync_interval", fallback=30.0),
+                    full_refresh_interval=config.getfloat("spreadsheet", "full_refresh_interval", fallback=600.0)
+                )
+
+    @classmethod
+    def _credentials(cls) -> Any:
+        """
+        Load the service-account credentials once and refresh the access
+        token when it is missing or expired.
+        """
+        with cls.client_lock:
+            if cls.credentials is None:
+                from google.oauth2 import service_account
+                cls.credentials = service_account.Credentials.from_service_account_file(
+                    cls.SERVICE_ACCOUNT_FILE or get_config()["default"]["spreadsheet_path"],
+                    scopes=cls.SCOPES
+                )
+            if not cls.credentials.valid:
+                from google.auth.transport.requests import Request
+                logger.info("Refreshing Google service account token")
+                cls.credentials.refresh(Request())
+            return cls.credentials
+
+    @classmethod
+    def _http(cls) -> Any:
+        """
+        Return the calling thread's authorized keep-alive HTTP transport.
+        """
+        http = getattr(cls.client_local, "http", None)
+        if http is None:
+            import httplib2
+            from google_auth_httplib2 import AuthorizedHttp
+            http = AuthorizedHttp(cls._credentials(), http=httplib2.Http(timeout=30))
+            cls.client_local.http = http
+        return http
+
+    def _service(self) -> Any:
+        """
+        Return the shared Sheets v4 client, building it on first use.
+
+        Requests built from it execute on the calling thread's transport, so
+        the client itself can be shared across the thread pool.
+        """
+        cls = type(self)
+        if cls.service is None:
+            with cls.client_lock:
+                if cls.service is None:
+                    import httplib2
+                    from googleapiclient.discovery import build
+                    from googleapiclient.http import HttpRequest
+                    # e.g. a local stand-in server for load tests
+                    endpoint = get_config().get("spreadsheet", "api_endpoint", fallback=None)
+                    cls.service = build(
+                        "sheets",
+                        "v4",
+                        http=httplib2.Http(),
+                        requestBuilder=lambda http, *args, **kwargs: HttpRequest(cls._http(), *args, **kwargs),
+                        cache_discovery=False,
+                        client_options={"api_endpoint": endpoint} if endpoint else None
+                    )
+        return cls.service
+
+    def _values(self) -> Any:
+        """
+        Return the shared `spreadsheets().values()` resource.
+
+        Creating discovery resources is expensive (tens of milliseconds), so
+        it is done once rather than per request.
+        """
+        cls = type(self)
+        if cls.values_resource is None:
+            cls.values_resource = self._service().spreadsheets().values()
+        return cls.values_resource
+
+    async def _sheets(self, request: Callable[[Any], Any], kind: Literal["read", "write"] = "read") -> dict:
+        """
+        Build and execute a Sheets `values()` request on the thread pool,
+        scheduled under the read or write quota.
 
         Args:
-            name (List[str]): List of assignee names.
-            project_name (List[str]): List of project names associated with each task.
-            task (List[str]): List of main task descriptions.
-            sub_task (List[str]): List of sub-task descriptions.
-            start_date (List[str]): List of task start dates (as strings).
-            assignor (List[str]): List of assignor names for each task.
+            request (Callable): Receives `spreadsheets().values()` and returns
+                the request to execute.
+            kind (str): "read" or "write", selecting quota and priority.
 
         Returns:
-            str: A success message indicating how many tasks were added.
+            dict: The API response.
+        """
+        def call() -> dict:
+            self._credentials()
+            return request(self._values()).execute()
+
+        loop = asyncio.get_running_loop()
+        with metrics.span(f"sheets.api.{kind}"):
+            return await self.scheduler.run(kind, lambda: loop.run_in_executor(self.executor, call))
+
+    def _append_queue(self) -> AppendQueue:
+        cls = type(self)
+        if cls.append_queue is None:
+            cls.append_queue = AppendQueue(
+                self._append_rows,
+                max_delay=get_config().getfloat("spreadsheet", "append_max_delay", fallback=0.2),
+                max_batch_size=get_config().getint("spreadsheet", "append_max_batch_size", fallback=500)
+            )
+        return cls.append_queue
+
+    async def _append_rows(self, values: List[list]) -> dict:
+        """
+        Append rows to the task sheet in a single request.
+        """
+        body = {"values": values}
+        return await self._sheets(lambda sheet: sheet.append(
+            spreadsheetId=self.SPREADSHEET_ID,
+            range=f"{self.SHEET}!A:N",
+            valueInputOption="RAW",
+            insertDataOption="INSERT_ROWS",
+            body=body
+        ), kind="write")
+
+    @classmethod
+    async def close(cls) -> None:
+        """
+        Flush queued appends. Call on application shutdown.
+        """
+        if cls.append_queue is not None:
+            await cls.append_queue.close()
+            cls.append_queue = None
+
+    @metrics.timed("sheets.bulk_append")
+    async def bulk_append(self, values: List[list]) -> dict:
+        """
+        Append a chunk of rows in one request, bypassing the append queue.
+        The rows are applied to the task cache only if it is loaded, so a
+        bulk import alone does not build up a copy of the sheet.
+
+        Returns:
+            dict: The Sheets append response.
+        """
+        result = await self._append_rows(values)
+        cache = self.task_cache
+        if cache.refreshed_at is not None:
+            async with cache.lock:
+                cache.apply_append(result.get("updates", {}).get("updatedRange"), values)
+        return result
+
+    async def read_pages(self, page_size: int = 5000, start: int = 1) -> AsyncIterator[List[list]]:
+        """
+        Read the task sheet `page_size` rows at a time, bypassing the task
+        cache so memory stays bounded by one page.
+
+        Sheets leaves trailing empty rows out of a range, so a short page
+        does not mean the sheet ended; reading stops at an empty page or
+        when the returned range ends before the page, at the sheet's last
+        row.
+
+        Args:
+            page_size (int): Rows per request.
+            start (int): First sheet row to read.
+
+        Yields:
+            List[list]: The rows of one page, in sheet order.
+        """
+        while True:
+            end = start + page_size - 1
+            result = await self._sheets(lambda sheet: sheet.get(
+                spreadsheetId=self.SPREADSHEET_ID,
+                range=f"{self.SHEET}!A{start}:N{end}"
+            ))
+            values = result.get("values", [])
+            if values:
+                yield values
+            last_row = re.search(r":[A-Z]+(\d+)$", result.get("range", ""))
+            if not values or (last_row and int(last_row.group(1)) < end):
+                return
+            start = end + 1
+
+    async def _sync_tasks(self) -> TaskCache:
+        """
+        Bring the task cache up to date: a full read when it is cold or due
+        for refresh, otherwise a read of rows past the high-water mark only
+        when `sync_interval` has elapsed.
+
+        Concurrent callers are coalesced into one read: whoever arrives while
+        a read is in flight waits for it and uses its result instead of
+        issuing another request. Counted in `task_cache.counters`.
+
+        Returns:
+            TaskCache: The synced cache.
+        """
+        cache = self.task_cache
+        if not cache.needs_full_refresh() and not cache.needs_sync():
+            cache.counters["cached"] += 1
+            return cache
+
+        async with cache.lock:
+            if cache.needs_full_refresh():
+                logger.info("Loading task sheet into cache")
+                result = await self._sheets(lambda sheet: sheet.get(
+                    spreadsheetId=self.SPREADSHEET_ID,
+                    range=f"{self.SHEET}!A:N"
+                ))
+                cache.load(result.get("values", []))
+                cache.counters["full_reads"] += 1
+            elif cache.needs_sync():
+                start = cache.high_water_mark + 1
+                result = await self._sheets(lambda sheet: sheet.get(
+                    spreadsheetId=self.SPREADSHEET_ID,
+                    range=f"{self.SHEET}!A{start}:N"
+                ))
+                cache.extend(result.get("values", []), start=start)
+                cache.counters["tail_reads"] += 1
+            else:
+                # another caller read the sheet while this one waited
+                cache.counters["coalesced"] += 1
+        return cache
+
+    @staticmethod
+    def task_rows(
+            name: List[str],
+            project_name: List[str],
+            task: List[str],
+            sub_task: List[str],
+            assignor: List[Optional[str]]
+        ) -> List[list]:
+        """
+        Build sheet rows (columns A:N) for new tasks.
 
         Raises:
             ValueError: If the length of input lists do not match.
-            Exception: For errors during Google Sheets API operations.
         """
         def datetime_to_serial(date: datetime) -> float:
             """
@@ -66,8 +333,6 @@ class SpreadsheetTool(BaseTaskManagement):
             epoch = datetime(1899, 12, 30)
             delta = date - epoch
             return delta.days + (delta.seconds / 86400) + (delta.microseconds / 86400_000000)
-        
-        logger.info("Attempting to append multiple tasks to spreadsheet")
 
         total_tasks = len(name)
         if not all(
@@ -76,12 +341,6 @@ class SpreadsheetTool(BaseTaskManagement):
         ):
             raise ValueError("❌ All input lists must have the same length")
         
-        creds = service_account.Credentials.from_service_account_file(
-            self.SERVICE_ACCOUNT_FILE, scopes=self.SCOPES
-        )
-        service = build("sheets", "v4", credentials=creds)
-        range_ = "Recap Task Agent!A:N"
-
         values = []
         for i in range(total_tasks):
             row = [
@@ -101,19 +360,49 @@ class SpreadsheetTool(BaseTaskManagement):
                 name[i],                                       # reference to assignee
             ]
             values.append(row)
+        return values
 
-        body = {"values": values}
-        result = service.spreadsheets().values().append(
-            spreadsheetId=self.SPREADSHEET_ID,
-            range=range_,
-            valueInputOption="RAW",
-            insertDataOption="INSERT_ROWS",
-            body=body
-        ).execute()
+    @metrics.timed("sheets.input_task_management")
+    async def input_task_management(
+            self, 
+            name: List[str],
+            project_name: List[str], 
+            task: List[str],
+            sub_task: List[str],
+            assignor: List[str]
+        ):
+        """
+        Append multiple task entries to the Google Spreadsheet.
+
+        Args:
+            name (List[str]): List of assignee names.
+            project_name (List[str]): List of project names associated with each task.
+            task (List[str]): List of main task descriptions.
+            sub_task (List[str]): List of sub-task descriptions.
+            start_date (List[str]): List of task start dates (as strings).
+            assignor (List[str]): List of assignor names for each task.
+
+        Returns:
+            str: A success message indicating how many tasks were added.
+
+        Raises:
+            ValueError: If the length of input lists do not match.
+            Exception: For errors during Google Sheets API operations.
+        """
+        logger.info("Attempting to append multiple tasks to spreadsheet")
+
+        total_tasks = len(name)
+        values = self.task_rows(name, project_name, task, sub_task, assignor)
+
+        result = await self._append_queue().submit(values)
+        cache = self.task_cache
+        async with cache.lock:
+            cache.apply_append(result.get("updates", {}).get("updatedRange"), values)
 
         logger.info(f"{total_tasks} task(s) successfully appended to spreadsheet")
         return f"✅ Task berhasil ditambahkan untuk detailnya bisa di cek di link spreadsheet berikut:\nhttps://docs.google.com/spreadsheets/d/1ERtqh9-4-gX1qQoIh9rcecnt2JvJN5GLJZQcteBEAYg/edit?gid=2142894050#gid=2142894050"
     
+    @metrics.timed("sheets.get_undone_task")
     async def get_undone_task(self, name: str) -> str:
         """
         Retrieve undone tasks for a given user from the Google Spreadsheet
@@ -127,30 +416,20 @@ class SpreadsheetTool(BaseTaskManagement):
                 Includes a formatted list of tasks if available.
         """
         logger.info(f"Fetching undone tasks for user: {name}")
-        creds = service_account.Credentials.from_service_account_file(
-            self.SERVICE_ACCOUNT_FILE, scopes=self.SCOPES
-        )
-        service = build("sheets", "v4", credentials=creds)
-
-        range_ = "Recap Task Agent!A:N"
-        result = service.spreadsheets().values().get(
-            spreadsheetId=self.SPREADSHEET_ID,
-            range=range_
-        ).execute()
 
-        values = result.get("values", [])
+        cache = await self._sync_tasks()
 
-        if not values:
+        if not cache.rows:
             logger.warning("No data found in the spreadsheet")
             return f"❌ Tidak ada data pada spreadsheet."
 
-        undone_tasks = [
-            row for row in values
-            if len(row) >= 6
-            and row[1].strip().lower() == name.strip().lower()
-            and row[12].strip().lower() != "done"
-        ]
+        return self.format_undone(name, [row for _, row in cache.undone(name)])
 
+    @staticmethod
+    def format_undone(name: str, undone_tasks: List[List[str]]) -> str:
+        """
+        Format a user's undone tasks as a Telegram message.
+        """
         if not undone_tasks:
             return f"✅ Tidak ada task yang belum selesai dari {name}.\n\nKEEP IT THE GOOD WORK 👍"
 
@@ -164,7 +443,53 @@ class SpreadsheetTool(BaseTaskManagement):
             f"📌 Terdapat {len(undone_tasks)} task yang belum selesai dari {name}:\n\n"
             f"{task_list}"
         )
+
+    @metrics.timed("sheets.get_task_table")
+    async def get_task_table(self) -> TaskTable:
+        """
+        Return a columnar snapshot of the task sheet for filters and
+        aggregates, e.g. open tasks per assignee or mean duration.
+        """
+        cache = await self._sync_tasks()
+        return cache.table()
+
+    @metrics.timed("sheets.get_team_undone_tasks")
+    async def get_team_undone_tasks(self) -> Dict[str, List[List[str]]]:
+        """
+        Retrieve the undone tasks of every assignee from a single read of
+        the sheet.
+
+        Returns:
+            Dict[str, List[List[str]]]: Undone rows keyed by assignee name as
+                written in the sheet.
+        """
+        logger.info("Fetching undone tasks for the whole team")
+        cache = await self._sync_tasks()
+        return {
+            rows[0][1][cache.ASSIGNEE].strip(): [row for _, row in rows]
+            for rows in cache.undone_by_assignee().values()
+        }
     
+    async def _current_rows(self, cache: TaskCache, matches: Dict[int, List[str]]) -> Dict[int, List[str]]:
+        """
+        Re-read the matched rows in one request and keep those the sheet
+        still holds unchanged (see `TaskCache.is_current`).
+        """
+        if not matches:
+            return {}
+        rows = sorted(matches)
+        result = await self._sheets(lambda sheet: sheet.batchGet(
+            spreadsheetId=self.SPREADSHEET_ID,
+            ranges=[f"{self.SHEET}!A{idx}:N{idx}" for idx in rows]
+        ))
+        current = {}
+        for idx, value_range in zip(rows, result.get("valueRanges", [])):
+            values = value_range.get("values") or [[]]
+            if cache.is_current(idx, values[0]):
+                current[idx] = matches[idx]
+        return current
+
+    @metrics.timed("sheets.update_task_status")
     async def update_task_status(
             self, 
             name: str, 
@@ -208,49 +533,61 @@ class SpreadsheetTool(BaseTaskManagement):
         
         logger.info(f"Updating task status for {name} - {', '.join(sub_tasks)} → {status}")
 
-        creds = service_account.Credentials.from_service_account_file(
-            self.SERVICE_ACCOUNT_FILE, scopes=self.SCOPES
-        )
-        service = build("sheets", "v4", credentials=creds)
+        # rows are written by index, so check them against the sheet first;
+        # if it was edited since the cache was loaded, reload and match again
+        for attempt in range(2):
+            cache = await self._sync_tasks()
+
+            if not cache.rows:
+                return "❌ Spreadsheet kosong."
+
+            matches = {}
+            for sub in sub_tasks:
+                if sub.strip():
+                    matches.update(cache.find_open(name, sub))
+
+            if not matches and attempt == 0 and cache.is_older_than(cache.sync_interval):
+                # the task may have been added or edited in the sheet since the last reload
+                async with cache.lock:
+                    cache.invalidate()
+                continue
+
+            current = await self._current_rows(cache, matches)
+            if len(current) == len(matches):
+                break
+            logger.warning(f"{len(matches) - len(current)} cached row(s) of {name} changed in the sheet")
+            matches = current
+            if attempt == 0:
+                async with cache.lock:
+                    cache.invalidate()
 
-        range_ = "Recap Task Agent!A:N"
-        result = service.spreadsheets().values().get(
-            spreadsheetId=self.SPREADSHEET_ID,
-            range=range_
-        ).execute()
-
-        values = result.get("values", [])
-
-        if not values:
-            return "❌ Spreadsheet kosong."
-        
         updates = []
+        updated_rows = []
         updated_tasks = []
-        for idx, row in enumerate(values, start=1):
-            if (
-                len(row) >= 13
-                and row[1].strip().lower() == name.strip().lower()
-                and row[12].strip().lower() != "done"
-                and any(sub.strip().lower() in row[5].strip().lower() for sub in sub_tasks)
-            ):
-                start_date = parse_gsheet_datetime(row[7])
-                end_date = datetime.now()
-                duration_minutes = int((end_date - start_date).total_seconds() / 60)
-
-                end_date_serial = datetime_to_serial(end_date)
-
-                updates.append({
-                    "range": f"Recap Task Agent!I{idx}:M{idx}", 
-                    "values": [[end_date_serial, duration_minutes, row[10], row[11], status]]
-                })
-                updated_tasks.append(row[5])
+        for idx, row in sorted(matches.items()):
+            start_date = parse_gsheet_datetime(row[7])
+            end_date = datetime.now()
+            duration_minutes = int((end_date - start_date).total_seconds() / 60)
+
+            end_date_serial = datetime_to_serial(end_date)
+
+            cells = [end_date_serial, duration_minutes, row[10], row[11], status]
+            updates.append({
+                "range": f"{self.SHEET}!I{idx}:M{idx}",
+                "values": [cells]
+            })
+            updated_rows.append((idx, cells))
+            updated_tasks.append(row[5])
         
         if updates:
             body = {"valueInputOption": "RAW", "data": updates}
-            service.spreadsheets().values().batchUpdate(
+            await self._sheets(lambda sheet: sheet.batchUpdate(
                 spreadsheetId=self.SPREADSHEET_ID,
                 body=body
-            ).execute()
+            ), kind="write")
+            async with cache.lock:
+                for idx, cells in updated_rows:
+                    cache.apply_update(idx, 8, cells)
             return f"✅ {len(updated_tasks)} task milik {name} berhasil diupdate → {', '.join(updated_tasks)}"
         
         return f"⚠️ Tidak ada task dari {name} yang cocok."
\ No newline at end of file
@@ -0,0 +1,281 @@
+import re
+import math
+import time
+import asyncio
+from typing import *
+from loguru import logger
+
+from tools.task_table import TaskTable
+
+class TaskCache:
+    """
+    In-process copy of the "Recap Task Agent" sheet indexed by assignee
+    (column B) and status (column M), plus open tasks by assignee and
+    sub-task (column F) for exact status-update matches.
+
+    Rows are kept in sheet order, padded to `COLUMNS` cells, so list index
+    `i` is sheet row `i + 1`. A header in row 1 (no date in column A) is
+    kept for alignment but never indexed as a task. The owner syncs it incrementally by reading
+    only rows past `high_water_mark` every `sync_interval` seconds, and
+    reloads it fully every `full_refresh_interval` seconds to pick up edits
+    made directly in the sheet. Writes made through `SpreadsheetTool` are
+    applied to the cache directly, so they never force a re-read unless
+    rows were added or deleted elsewhere in the meantime.
+
+    Args:
+        sync_interval (float): Seconds between incremental tail reads.
+        full_refresh_interval (float): Seconds between full reloads.
+    """
+
+    COLUMNS: ClassVar[int] = 14
+    ASSIGNEE: ClassVar[int] = 1
+    SUB_TASK: ClassVar[int] = 5
+    STATUS: ClassVar[int] = 12
+    DONE: ClassVar[str] = "done"
+
+    def __init__(self, sync_interval: float = 30.0, full_refresh_interval: float = 600.0):
+        self.sync_interval = sync_interval
+        self.full_refresh_interval = full_refresh_interval
+        self.lock = asyncio.Lock()
+
+        self.rows: List[List[str]] = []
+        self._by_assignee: Dict[str, Set[int]] = {}
+        self._by_status: Dict[str, Set[int]] = {}
+        self._open_by_assignee: Dict[str, Set[int]] = {}
+        self._open_by_sub_task: Dict[Tuple[str, str], Set[int]] = {}
+        self.synced_at: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+        self.counters: Dict[str, int] = {"full_reads": 0, "tail_reads": 0, "cached": 0, "coalesced": 0}
+        self._table: Optional[TaskTable] = None
+
+    @staticmethod
+    def key(value: Any) -> str:
+        return str(value or "").strip().lower()
+
+    @property
+    def high_water_mark(self) -> int:
+        """
+        Last sheet row number held in the cache.
+        """
+        return len(self.rows)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return read counters, the share of lookups served without a read of
+        their own, and the number of cached rows.
+        """
+        lookups = sum(self.counters.values())
+        served = self.counters["cached"] + self.counters["coalesced"]
+        return {**self.counters, "hit_rate": served / lookups if lookups else 0.0, "rows": len(self.rows)}
+
+    def needs_full_refresh(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return self.refreshed_at is None or now - self.refreshed_at >= self.full_refresh_interval
+
+    def needs_sync(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return self.synced_at is None or now - self.synced_at >= self.sync_interval
+
+    def is_older_than(self, seconds: float, now: Optional[float] = None) -> bool:
+        """
+        Whether the last full reload happened more than `seconds` ago.
+        """
+        now = time.monotonic() if now is None else now
+        return self.refreshed_at is None or now - self.refreshed_at >= seconds
+
+    def invalidate(self) -> None:
+        """
+        Force a full reload on the next sync.
+        """
+        self.refreshed_at = None
+
+    def load(self, values: List[list]) -> None:
+        """
+        Replace the cache with a full read of the sheet.
+        """
+        self.rows = []
+        self._by_assignee = {}
+        self._by_status = {}
+        self._open_by_assignee = {}
+        self._open_by_sub_task = {}
+        # once a table was asked for, keep it current through reloads
+        self._table = None if self._table is None else TaskTable()
+        self.extend(values)
+        self.refreshed_at = self.synced_at
+
+    def extend(self, values: List[list], start: Optional[int] = None) -> None:
+        """
+        Append rows read past the high-water mark.
+
+        Args:
+            values (List[list]): Rows read from the sheet.
+            start (int, optional): Sheet row of `values[0]`. Anything but
+                the row after the high-water mark means cached row numbers
+                no longer match the sheet, and forces a full reload instead.
+        """
+        if start is not None and start != self.high_water_mark + 1:
+            self.invalidate()
+            return
+        self._append(values)
+        self.synced_at = time.monotonic()
+        if values:
+            logger.debug(f"Task cache synced {len(values)} row(s), high-water mark {self.high_water_mark}")
+
+    def apply_append(self, updated_range: Optional[str], values: List[list]) -> None:
+        """
+        Apply rows written by a `values().append` call. Hold `lock`, so a
+        sync in flight cannot add the same rows again.
+
+        Args:
+            updated_range (str): `updates.updatedRange` from the append response.
+            values (List[list]): The rows that were appended.
+        """
+        match = re.search(r"![A-Z]+(\d+)", updated_range or "")
+        start = int(match.group(1)) if match else None
+        if start is not None and start <= self.high_water_mark:
+            # rows were deleted in the sheet, so cached row numbers are off
+            self.invalidate()
+            return
+        if start is None or start > self.high_water_mark + 1:
+            # rows were added elsewhere in the meantime; pick them up on next sync
+            self.synced_at = None
+            return
+        self._append(values)
+
+    def apply_update(self, row_number: int, first_column: int, values: List[Any]) -> None:
+        """
+        Apply cells written by a `values().batchUpdate` call to one row.
+        Hold `lock`, so a reload in flight cannot undo it.
+
+        Args:
+            row_number (int): 1-based sheet row.
+            first_column (int): 0-based column of the first written cell.
+            values (List[Any]): Cell values written left to right.
+        """
+        i = row_number - 1
+        if i >= len(self.rows):
+            self.synced_at = None
+            return
+        self._unindex(i)
+        row = self.rows[i]
+        for offset, value in enumerate(values):
+            row[first_column + offset] = self._cell(value)
+        self._index(i)
+        if self._table is not None:
+            self._table.update(i, self._table_row(i))
+
+    def is_current(self, row_number: int, row: list) -> bool:
+        """
+        Check a freshly read sheet row against the cache: it must still hold
+        the same assignee and sub-task and not be marked done. A mismatch
+        means rows were deleted, inserted or sorted in the sheet.
+        """
+        i = row_number - 1
+        if i >= len(self.rows):
+            return False
+        fresh, cached = self._pad(row), self.rows[i]
+        return (
+            self.key(fresh[self.ASSIGNEE]) == self.key(cached[self.ASSIGNEE])
+            and self.key(fresh[self.SUB_TASK]) == self.key(cached[self.SUB_TASK])
+            and self.key(fresh[self.STATUS]) != self.DONE
+        )
+
+    def undone(self, name: str) -> List[Tuple[int, List[str]]]:
+        """
+        Return `(row_number, row)` for every task of `name` not marked done.
+        """
+        return [(i + 1, self.rows[i]) for i in sorted(self._open_by_assignee.get(self.key(name), ()))]
+
+    def find_open(self, name: str, sub_task: str) -> List[Tuple[int, List[str]]]:
+        """
+        Return open tasks of `name` whose sub-task matches `sub_task`.
+
+        An exact (case-insensitive) match is an index lookup; only when there
+        is none are the assignee's open tasks scanned for a substring match.
+        """
+        assignee, query = self.key(name), self.key(sub_task)
+        rows = self._open_by_sub_task.get((assignee, query))
+        if rows is None:
+            rows = {
+                i for i in self._open_by_assignee.get(assignee, ())
+                if query in self.key(self.rows[i][self.SUB_TASK])
+            }
+        return [(i + 1, self.rows[i]) for i in sorted(rows)]
+
+    def undone_by_assignee(self) -> Dict[str, List[Tuple[int, List[str]]]]:
+        """
+        Return `(row_number, row)` of every task not marked done, grouped by
+        normalized assignee name.
+        """
+        return {
+            assignee: [(i + 1, self.rows[i]) for i in sorted(rows)]
+            for assignee, rows in self._open_by_assignee.items()
+        }
+
+    def by_assignee(self, name: str) -> List[Tuple[int, List[str]]]:
+        return [(i + 1, self.rows[i]) for i in sorted(self._by_assignee.get(self.key(name), ()))]
+
+    def by_status(self, status: str) -> List[Tuple[int, List[str]]]:
+        return [(i + 1, self.rows[i]) for i in sorted(self._by_status.get(self.key(status), ()))]
+
+    def table(self) -> TaskTable:
+        """
+        Return a columnar view of the cached rows for filters and
+        aggregates beyond the indexes kept here.
+
+        Built on first use, then kept up to date as rows are appended,
+        updated or reloaded. It costs about 64 bytes per row on top of the
+        rows themselves, so it is only built for callers that need it.
+        """
+        if self._table is None:
+            self._table = TaskTable.from_rows(self._table_row(i) for i in range(len(self.rows)))
+        return self._table
+
+    def _table_row(self, i: int) -> List[str]:
+        # a blank row in place of the header keeps table index == list index
+        return [""] * self.COLUMNS if self.is_header(i) else self.rows[i]
+
+    def _append(self, values: List[list]) -> None:
+        for row in values:
+            self.rows.append(self._pad(row))
+            self._index(len(self.rows) - 1)
+            if self._table is not None:
+                self._table.append(self._table_row(len(self.rows) - 1))
+
+    @staticmethod
+    def _cell(value: Any) -> str:
+        return "" if value is None else str(value)
+
+    def _pad(self, row: list) -> List[str]:
+        cells = [self._cell(value) for value in row[:self.COLUMNS]]
+        cells.extend([""] * (self.COLUMNS - len(cells)))
+        return cells
+
+    def is_header(self, i: int) -> bool:
+        return i == 0 and math.isnan(TaskTable.serial(self.rows[0][0]))
+
+    def _index(self, i: int) -> None:
+        row = self.rows[i]
+        assignee, status = self.key(row[self.ASSIGNEE]), self.key(row[self.STATUS])
+        if not assignee or self.is_header(i):
+            return
+        self._by_assignee.setdefault(assignee, set()).add(i)
+        self._by_status.setdefault(status, set()).add(i)
+        if status != self.DONE:
+            self._open_by_assignee.setdefault(assignee, set()).add(i)
+            self._open_by_sub_task.setdefault((assignee, self.key(row[self.SUB_TASK])), set()).add(i)
+
+    def _unindex(self, i: int) -> None:
+        row = self.rows[i]
+        assignee, status = self.key(row[self.ASSIGNEE]), self.key(row[self.STATUS])
+        for index, key in (
+            (self._by_assignee, assignee),
+            (self._by_status, status),
+            (self._open_by_assignee, assignee),
+            (self._open_by_sub_task, (assignee, self.key(row[self.SUB_TASK]))),
+        ):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.discard(i)
+                if not bucket:
+                    del index[key]
\ No newline at end of file
@@ -0,0 +1,47 @@
+import re
+from typing import *
+
+from tools.utils import ATMFormat
+
+BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+
+def parse_task_message(text: str, name: str) -> Optional[ATMFormat]:
+    """
+    Parse a message written in the documented task format, one task per line:
+
+        Project Name | Sub Task | Assignor
+
+    Every line needs all three fields; the assignor may be left blank
+    ("Project Name | Sub Task |"), so a line with a single "|" is free-form
+    text. Leading bullets or numbering are ignored. Categories are left
+    empty for the caller to fill in.
+
+    Args:
+        text (str): The Telegram message text.
+        name (str): The sender, used as assignee for every task.
+
+    Returns:
+        Optional[ATMFormat]: The task payload, or None if any non-empty line
+            does not follow the format (the message is then free-form text).
+    """
+    project_name, sub_task, assignor = [], [], []
+    for line in text.splitlines():
+        line = BULLET.sub("", line).strip()
+        if not line:
+            continue
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) != 3 or not parts[0] or not parts[1]:
+            return None
+        project_name.append(parts[0])
+        sub_task.append(parts[1])
+        assignor.append(parts[2] or None)
+
+    if not sub_task:
+        return None
+    return ATMFormat(
+        name=[name] * len(sub_task),
+        project_name=project_name,
+        task=[""] * len(sub_task),
+        sub_task=sub_task,
+        assignor=assignor
+    )
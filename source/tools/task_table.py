@@ -0,0 +1,223 @@
+import math
+import bisect
+from array import array
+from typing import *
+from datetime import datetime
+from collections import Counter
+
+class TaskTable:
+    """
+    Compact columnar snapshot of the task sheet for filtering and
+    aggregation.
+
+    Assignee, project, task category and status are dictionary-encoded:
+    each distinct (case-insensitive) value is stored once and rows hold a
+    4-byte code, with a posting list of row indices per code. The created,
+    start and end dates (Sheets serial days) and the duration in minutes
+    are stored as float arrays, NaN when empty or unparseable. A row costs
+    about 64 bytes instead of a list of 14 strings.
+
+    Filters combine the smallest matching posting list with checks on the
+    code and date arrays; aggregates count or average over the arrays
+    directly; rows without an assignee (such as the blank stand-in for the
+    header) are not tasks and are left out of counts. Row indices are
+    0-based, so sheet row = index + 1. Rows are added with `append` and
+    changed in place with `update`.
+    """
+
+    CATEGORICAL: ClassVar[Dict[str, int]] = {"assignee": 1, "project": 3, "task": 4, "status": 12}
+    NUMERIC: ClassVar[Dict[str, int]] = {"created": 0, "start": 7, "end": 8, "duration": 9}
+    DONE: ClassVar[str] = "done"
+    DATE_FORMATS: ClassVar[Tuple[str, ...]] = ("%m/%d/%Y %H:%M:%S", "%m/%d/%Y")
+    EPOCH: ClassVar[datetime] = datetime(1899, 12, 30)
+
+    def __init__(self):
+        self.labels: Dict[str, List[str]] = {column: [] for column in self.CATEGORICAL}
+        self._codes: Dict[str, Dict[str, int]] = {column: {} for column in self.CATEGORICAL}
+        self.codes: Dict[str, array] = {column: array("I") for column in self.CATEGORICAL}
+        self.postings: Dict[str, List[array]] = {column: [] for column in self.CATEGORICAL}
+        self.values: Dict[str, array] = {column: array("d") for column in self.NUMERIC}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]]) -> "TaskTable":
+        table = cls()
+        for row in rows:
+            table.append(row)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.values["created"])
+
+    @staticmethod
+    def key(value: Any) -> str:
+        return str(value or "").strip().lower()
+
+    @classmethod
+    def serial(cls, value: Any) -> float:
+        """
+        Parse a Sheets serial number or date string to serial days.
+        """
+        if value is None or value == "":
+            return math.nan
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            pass
+        for fmt in cls.DATE_FORMATS:
+            try:
+                delta = datetime.strptime(str(value), fmt) - cls.EPOCH
+                return delta.days + delta.seconds / 86400
+            except ValueError:
+                continue
+        return math.nan
+
+    def encode(self, column: str, value: Any) -> Optional[int]:
+        """
+        Return the code of `value` in `column`, or None if it never occurs.
+        """
+        return self._codes[column].get(self.key(value))
+
+    def _code(self, column: str, value: Any) -> int:
+        key = self.key(value)
+        codes = self._codes[column]
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(self.labels[column])
+            self.labels[column].append(str(value or "").strip())
+            self.postings[column].append(array("I"))
+        return code
+
+    def append(self, row: Sequence[Any]) -> None:
+        i = len(self)
+        for column, position in self.CATEGORICAL.items():
+            code = self._code(column, row[position] if position < len(row) else "")
+            self.codes[column].append(code)
+            self.postings[column][code].append(i)
+        for column, position in self.NUMERIC.items():
+            self.values[column].append(self.serial(row[position] if position < len(row) else None))
+
+    def update(self, i: int, row: Sequence[Any]) -> None:
+        """
+        Replace row `i` in place, moving it between posting lists whose
+        value changed.
+        """
+        for column, position in self.CATEGORICAL.items():
+            code = self._code(column, row[position] if position < len(row) else "")
+            previous = self.codes[column][i]
+            if code == previous:
+                continue
+            old = self.postings[column][previous]
+            del old[bisect.bisect_left(old, i)]
+            bisect.insort(self.postings[column][code], i)
+            self.codes[column][i] = code
+        for column, position in self.NUMERIC.items():
+            self.values[column][i] = self.serial(row[position] if position < len(row) else None)
+
+    def select(
+            self,
+            assignee: Optional[str] = None,
+            project: Optional[str] = None,
+            task: Optional[str] = None,
+            status: Optional[str] = None,
+            open_only: bool = False,
+            date_from: Optional[float] = None,
+            date_to: Optional[float] = None,
+            date_column: str = "start"
+        ) -> List[int]:
+        """
+        Return indices of rows matching every given filter.
+
+        Args:
+            assignee, project, task, status (str, optional): Case-insensitive equality filters.
+            open_only (bool): Only rows whose status is not "done".
+            date_from, date_to (float, optional): Inclusive serial-day bounds on `date_column`.
+            date_column (str): One of "created", "start", "end".
+
+        Returns:
+            List[int]: Matching row indices in sheet order.
+        """
+        equals = []
+        for column, value in (("assignee", assignee), ("project", project), ("task", task), ("status", status)):
+            if value is not None:
+                code = self.encode(column, value)
+                if code is None:
+                    return []
+                equals.append((column, code))
+
+        if equals:
+            equals.sort(key=lambda item: len(self.postings[item[0]][item[1]]))
+            column, code = equals[0]
+            candidates: Iterable[int] = self.postings[column][code]
+            for column, code in equals[1:]:
+                codes = self.codes[column]
+                candidates = [i for i in candidates if codes[i] == code]
+        else:
+            candidates = range(len(self))
+
+        if open_only:
+            done = self.encode("status", self.DONE)
+            if done is not None:
+                status_codes = self.codes["status"]
+                candidates = [i for i in candidates if status_codes[i] != done]
+
+        if date_from is not None or date_to is not None:
+            dates = self.values[date_column]
+            low = -math.inf if date_from is None else date_from
+            high = math.inf if date_to is None else date_to
+            if isinstance(candidates, range):
+                candidates = [i for i, date in enumerate(dates) if low <= date <= high]
+            else:
+                candidates = [i for i in candidates if low <= dates[i] <= high]
+        return list(candidates)
+
+    def count_by(self, column: str, indices: Optional[Iterable[int]] = None) -> Dict[str, int]:
+        """
+        Count tasks per non-empty value of a dictionary-encoded column.
+        """
+        codes = self.codes[column]
+        blank = self.encode("assignee", "")
+        if blank is None:
+            counts = Counter(codes) if indices is None else Counter(codes[i] for i in indices)
+        else:
+            assignees = self.codes["assignee"]
+            rows = range(len(self)) if indices is None else indices
+            counts = Counter(codes[i] for i in rows if assignees[i] != blank)
+        labels = self.labels[column]
+        return {labels[code]: count for code, count in counts.most_common() if labels[code]}
+
+    def open_by(self, column: str) -> Dict[str, int]:
+        """
+        Count tasks not marked done per value of `column`, e.g. open tasks per assignee.
+        """
+        return self.count_by(column, self.select(open_only=True))
+
+    def mean_duration(self, by: Optional[str] = None, indices: Optional[Iterable[int]] = None) -> Union[float, Dict[str, float]]:
+        """
+        Mean duration in minutes over rows that have one, overall or per
+        value of `by`.
+        """
+        durations = self.values["duration"]
+        rows = range(len(self)) if indices is None else indices
+        if by is None:
+            present = [duration for duration in (durations if indices is None else (durations[i] for i in rows)) if duration == duration]
+            return sum(present) / len(present) if present else math.nan
+
+        labels = self.labels[by]
+        if indices is None:
+            means = {}
+            for code, posting in enumerate(self.postings[by]):
+                # NaN != NaN, so rows without a duration are skipped
+                present = [duration for duration in map(durations.__getitem__, posting) if duration == duration]
+                if present:
+                    means[labels[code]] = sum(present) / len(present)
+            return means
+
+        codes = self.codes[by]
+        totals: Dict[int, List[float]] = {}
+        for i in rows:
+            duration = durations[i]
+            if duration == duration:
+                total = totals.setdefault(codes[i], [0.0, 0])
+                total[0] += duration
+                total[1] += 1
+        return {labels[code]: total / count for code, (total, count) in totals.items()}
\ No newline at end of file
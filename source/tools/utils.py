@@ -52,4 +52,28 @@ class ATMFormat(BaseModel):
 class CTMFormat(BaseModel):
     name: str = Field(
         description="The name of the user whose tasks should be checked."
-    )
\ No newline at end of file
+    )
+
+class TaskCategoryFormat(BaseModel):
+    task: List[str] = Field(
+        description=(
+            "One task category per sub-task, in the same order. "
+            "Allowed categories include: Research, Project, Maintenance, "
+            "Delivery, Pitching, Development, or any other suitable category."
+        )
+    )
+
+class UTSFormat(BaseModel):
+    """
+    Schema for updating the status of a user's tasks.
+    """
+    name: str = Field(
+        description="The name of the user (assignee) whose tasks should be updated."
+    )
+    sub_tasks: List[str] = Field(
+        description="List of sub-task descriptions to update, as written when the tasks were added."
+    )
+    status: str = Field(
+        default="done",
+        description="The new status for the matched tasks. Use 'done' when the user finished them."
+    )